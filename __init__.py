@@ -1,10 +1,10 @@
 """Shell Motorsport RC Car control library."""
 try:
-    from .shell_motorsport import ShellMotorsportCar, Controller
+    from .shell_motorsport import ShellMotorsportCar, Controller, JoyConHandler
 except ImportError:
     # Fallback for direct script execution
-    from shell_motorsport import ShellMotorsportCar, Controller
+    from shell_motorsport import ShellMotorsportCar, Controller, JoyConHandler
 
 __version__ = "0.2.0"
-__all__ = ["ShellMotorsportCar", "Controller"]
+__all__ = ["ShellMotorsportCar", "Controller", "JoyConHandler"]
 
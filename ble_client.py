@@ -1,110 +1,271 @@
 """BLE client module for RC car communication."""
 import asyncio
 import logging
-from typing import Optional
+from typing import Collection, Dict, List, Optional, Set, Tuple, Union
 from bleak import BleakClient, BleakScanner, BLEDevice
+from bleak.backends.characteristic import BleakGATTCharacteristic
+from bleak.backends.scanner import AdvertisementData
+from bleak.uuids import normalize_uuid_str
 
 # Handle both package and direct script execution
 try:
     from .config import (
-        SERVICE_UUID,
+        SCAN_SERVICE_UUIDS,
+        KEEPALIVE_SECONDS,
         WRITE_CHAR_UUID,
         SCAN_TIMEOUT,
+        FILTERED_SCAN_TIMEOUT,
         CONNECTION_TIMEOUT,
         MAX_SCAN_RETRIES,
         SCAN_RETRY_DELAY,
+        SCAN_RETRY_BASE_DELAY,
+        DEVICE_CACHE_SECONDS,
     )
 except ImportError:
     # Fallback for direct script execution
     from config import (
-        SERVICE_UUID,
+        SCAN_SERVICE_UUIDS,
+        KEEPALIVE_SECONDS,
         WRITE_CHAR_UUID,
         SCAN_TIMEOUT,
+        FILTERED_SCAN_TIMEOUT,
         CONNECTION_TIMEOUT,
         MAX_SCAN_RETRIES,
         SCAN_RETRY_DELAY,
+        SCAN_RETRY_BASE_DELAY,
+        DEVICE_CACHE_SECONDS,
     )
 
 logger = logging.getLogger(__name__)
 
+# Cars seen while scanning, by name, with the loop time they were last seen.
+# Shared by every client so naming a car and then connecting to it, or
+# setting up several cars, does not restart discovery for a car just seen.
+_recent_devices: Dict[str, Tuple[BLEDevice, float]] = {}
+
+# Set once a car has only turned up in a name-only scan, meaning it does not
+# list the control service in its advertisement; later scans skip the filter
+# instead of waiting out the filtered window again.
+_service_filter_misses_cars: bool = False
+
+
+def _remember_device(device: BLEDevice, now: float) -> None:
+    """Record a sighting, dropping expired entries whenever a new car is added."""
+    if device.name not in _recent_devices:
+        for name, (_, seen) in list(_recent_devices.items()):
+            if now - seen >= DEVICE_CACHE_SECONDS:
+                del _recent_devices[name]
+    _recent_devices[device.name] = (device, now)
+
+
+def _find_recent_device(device_id: str, now: float) -> Optional[BLEDevice]:
+    """Find a car seen within DEVICE_CACHE_SECONDS, matched like a scan matches names."""
+    recent = _recent_devices.get(device_id)
+    if recent is not None and now - recent[1] < DEVICE_CACHE_SECONDS:
+        return recent[0]
+    # Scans match device_id as a substring of the advertised name
+    for name, (device, seen) in _recent_devices.items():
+        if device_id in name and now - seen < DEVICE_CACHE_SECONDS:
+            return device
+    return None
+
 
 class BLEClient:
     """Handles BLE communication with RC cars."""
 
-    def __init__(self):
-        """Initialize the BLE client."""
+    __slots__ = (
+        "client",
+        "device",
+        "_is_connected",
+        "keepalive_seconds",
+        "_last_write",
+        "_idle_disconnect_task",
+        "_write_char",
+        "_write_response",
+        "_confirmed_response",
+        "_write_lock",
+    )
+
+    def __init__(self, keepalive_seconds: Optional[float] = KEEPALIVE_SECONDS):
+        """
+        Initialize the BLE client.
+
+        Args:
+            keepalive_seconds: Idle time after the last write before the link is
+                released. If None, the connection is held until disconnect().
+        """
         self.client: Optional[BleakClient] = None
         self.device: Optional[BLEDevice] = None
         self._is_connected: bool = False
+        self.keepalive_seconds = keepalive_seconds
+        self._last_write: float = 0.0
+        self._idle_disconnect_task: Optional[asyncio.Task] = None
+        self._write_char: Union[BleakGATTCharacteristic, str] = WRITE_CHAR_UUID
+        self._write_response: bool = False
+        self._confirmed_response: bool = True
+        # Created on first write so it binds to the loop doing the writing
+        self._write_lock: Optional[asyncio.Lock] = None
 
     @property
     def is_connected(self) -> bool:
         """Check if currently connected to a device."""
-        return self._is_connected and self.client is not None and self.client.is_connected
+        # Kept current by connect(), disconnect() and the link-loss callback,
+        # so the per-frame check never has to ask the backend
+        return self._is_connected
+
+    def _on_disconnected(self, client: BleakClient) -> None:
+        """Mark the link as down when the backend reports it was lost."""
+        if client is self.client and self._is_connected:
+            logger.warning("Connection to RC car lost.")
+            self._reset_link_state()
+
+    def _reset_link_state(self) -> None:
+        """Forget everything learned about the current link."""
+        self._is_connected = False
+        self.device = None
+        self._write_char = WRITE_CHAR_UUID
+        self._write_response = False
+        self._confirmed_response = True
 
     async def scan_for_device(
-        self, device_id: Optional[str] = None, device_name_pattern: str = "QCAR"
+        self,
+        device_id: Optional[str] = None,
+        device_name_pattern: str = "QCAR",
+        budget: Optional[float] = None,
+        exclude: Collection[str] = (),
     ) -> Optional[BLEDevice]:
         """
         Scan for BLE devices matching the criteria.
 
+        Failed attempts are retried with exponential backoff starting at
+        SCAN_RETRY_BASE_DELAY and capped at SCAN_RETRY_DELAY. A device_id
+        advertised during any scan in the last DEVICE_CACHE_SECONDS is
+        returned without scanning again. Each attempt first scans for cars
+        advertising the control service for FILTERED_SCAN_TIMEOUT, then by
+        name only; once a car has only been found by name, later scans skip
+        the filtered pass.
+
         Args:
             device_id: Specific device ID to find (e.g., "QCAR-0000044")
             device_name_pattern: Pattern to match in device name (default: "QCAR")
+            budget: Total time in seconds to spend scanning across all attempts.
+                If None, only MAX_SCAN_RETRIES bounds the search.
+            exclude: Device names to skip, e.g. cars that are already registered
 
         Returns:
             Found BLEDevice or None if not found
 
         Raises:
-            TimeoutError: If scan times out after max retries
+            TimeoutError: If scan times out after max retries or the budget runs out
         """
-        for attempt in range(MAX_SCAN_RETRIES):
+        global _service_filter_misses_cars
+        loop = asyncio.get_running_loop()
+
+        if device_id:
+            recent = _find_recent_device(device_id, loop.time())
+            if recent is not None:
+                logger.info("Using recently seen device: %s (%s)", recent.name, recent.address)
+                return recent
+
+        # Addresses already ruled out, kept across retries so repeated
+        # advertisements from nearby devices are dropped immediately
+        rejected: Set[str] = set()
+
+        def matches(device: BLEDevice, advertisement_data: AdvertisementData) -> bool:
+            if device.address in rejected:
+                return False
             try:
-                logger.info(f"Scanning for devices (attempt {attempt + 1}/{MAX_SCAN_RETRIES})...")
-                devices = await asyncio.wait_for(
-                    BleakScanner.discover(), timeout=SCAN_TIMEOUT
+                device_name = device.name or ""
+                if device_name_pattern in device_name:
+                    _remember_device(device, loop.time())
+                if device_name in exclude:
+                    found = False
+                elif device_id:
+                    found = device_id in device_name
+                else:
+                    found = device_name_pattern in device_name
+            except Exception as e:
+                logger.debug("Error checking device %s: %s", device, e)
+                return False
+            # The name may only arrive with a later scan response, so only
+            # remember devices that have announced a non-matching name
+            if not found and device_name:
+                rejected.add(device.address)
+            return found
+
+        # BlueZ only matches full 128-bit UUIDs, so expand the short form.
+        # Cleared once a filtered scan comes up empty: some cars expose the
+        # service without listing it in their advertisement.
+        service_uuids: Optional[List[str]] = None
+        if not _service_filter_misses_cars:
+            service_uuids = [
+                normalize_uuid_str(uuid) for uuid in SCAN_SERVICE_UUIDS
+            ] or None
+
+        deadline = None if budget is None else loop.time() + budget
+
+        for attempt in range(MAX_SCAN_RETRIES):
+            scan_timeout = SCAN_TIMEOUT
+            if deadline is not None:
+                scan_timeout = min(scan_timeout, deadline - loop.time())
+                if scan_timeout <= 0:
+                    break
+
+            logger.info(
+                "Scanning for devices (attempt %d/%d)...", attempt + 1, MAX_SCAN_RETRIES
+            )
+            # Returns as soon as a matching advertisement arrives instead of
+            # waiting out the whole scan window
+            device = None
+            if service_uuids is not None:
+                # Cars that advertise the service show up within a few
+                # advertising intervals, so the filtered pass is kept short
+                device = await BleakScanner.find_device_by_filter(
+                    matches,
+                    timeout=min(scan_timeout, FILTERED_SCAN_TIMEOUT),
+                    service_uuids=service_uuids,
+                )
+                if device is None:
+                    logger.info("No car advertised the control service. Matching by name only...")
+                    service_uuids = None
+                    if deadline is not None:
+                        scan_timeout = min(scan_timeout, deadline - loop.time())
+                    if scan_timeout > 0:
+                        device = await BleakScanner.find_device_by_filter(
+                            matches, timeout=scan_timeout, service_uuids=None
+                        )
+                        if device is not None:
+                            _service_filter_misses_cars = True
+            else:
+                device = await BleakScanner.find_device_by_filter(
+                    matches, timeout=scan_timeout, service_uuids=None
                 )
 
-                for device in devices:
-                    try:
-                        device_name = device.name or ""
-                        if device_id:
-                            if device_id in device_name:
-                                logger.info(
-                                    f"Found target device: {device_name} ({device.address})"
-                                )
-                                return device
-                        elif device_name_pattern in device_name:
-                            logger.info(
-                                f"Found matching device: {device_name} ({device.address})"
-                            )
-                            return device
-                    except Exception as e:
-                        logger.debug(f"Error checking device {device}: {e}")
-                        continue
-
-                if attempt < MAX_SCAN_RETRIES - 1:
-                    logger.warning(
-                        f"Device not found. Retrying in {SCAN_RETRY_DELAY} seconds..."
-                    )
-                    await asyncio.sleep(SCAN_RETRY_DELAY)
-                else:
-                    logger.error(
-                        f"Device not found after {MAX_SCAN_RETRIES} attempts. "
-                        "Make sure the car is powered on and in range."
-                    )
-                    raise TimeoutError(
-                        f"Could not find device after {MAX_SCAN_RETRIES} scan attempts"
-                    )
-
-            except asyncio.TimeoutError:
-                logger.warning(f"Scan timeout (attempt {attempt + 1}/{MAX_SCAN_RETRIES})")
-                if attempt < MAX_SCAN_RETRIES - 1:
-                    await asyncio.sleep(SCAN_RETRY_DELAY)
+            if device:
+                if device_id:
+                    logger.info("Found target device: %s (%s)", device.name, device.address)
                 else:
-                    raise TimeoutError("BLE scan timed out")
+                    logger.info("Found matching device: %s (%s)", device.name, device.address)
+                return device
+
+            if attempt < MAX_SCAN_RETRIES - 1:
+                delay = min(SCAN_RETRY_DELAY, SCAN_RETRY_BASE_DELAY * (2 ** attempt))
+                if deadline is not None:
+                    delay = min(delay, max(0.0, deadline - loop.time()))
+                logger.warning("Device not found. Retrying in %.2f seconds...", delay)
+                await asyncio.sleep(delay)
+            else:
+                logger.error(
+                    "Device not found after %d attempts. "
+                    "Make sure the car is powered on and in range.",
+                    MAX_SCAN_RETRIES,
+                )
+                raise TimeoutError(
+                    f"Could not find device after {MAX_SCAN_RETRIES} scan attempts"
+                )
 
-        return None
+        logger.error("Scan budget of %s seconds exhausted.", budget)
+        raise TimeoutError(f"Could not find device within {budget} seconds")
 
     async def connect(self, device: BLEDevice) -> None:
         """
@@ -121,43 +282,99 @@ class BLEClient:
             await self.disconnect()
 
         self.device = device
-        self.client = BleakClient(device.address)
+        # Reuse the client bound to this address so backend caches survive a
+        # reconnect; only build a new one when switching cars. Passing the
+        # scanned BLEDevice rather than its address lets the backend connect
+        # directly instead of scanning for the address a second time.
+        if self.client is None or self.client.address != device.address:
+            self.client = BleakClient(
+                device, disconnected_callback=self._on_disconnected
+            )
 
         try:
-            logger.info(f"Connecting to {device.name} ({device.address})...")
+            logger.info("Connecting to %s (%s)...", device.name, device.address)
             await asyncio.wait_for(
                 self.client.connect(), timeout=CONNECTION_TIMEOUT
             )
             self._is_connected = True
             logger.info("Successfully connected to RC car.")
+            # Resolve the write characteristic once instead of on every write
+            self._write_char = (
+                self.client.services.get_characteristic(WRITE_CHAR_UUID)
+                or WRITE_CHAR_UUID
+            )
+            # Control frames need no ACK; only fall back to write-with-response
+            # when the car does not advertise write-without-response
+            properties = getattr(self._write_char, "properties", None)
+            self._write_response = (
+                properties is not None and "write-without-response" not in properties
+            )
+            # Acknowledged writes are used when the car lists plain "write"
+            self._confirmed_response = properties is None or "write" in properties
+            self._touch()
         except asyncio.TimeoutError:
             self._is_connected = False
+            # The car may have gone away; make the next lookup scan for it again
+            _recent_devices.pop(device.name, None)
             logger.error("Connection timeout")
             raise ConnectionError("Failed to connect: timeout")
         except Exception as e:
             self._is_connected = False
-            logger.error(f"Failed to connect: {e}")
+            _recent_devices.pop(device.name, None)
+            logger.error("Failed to connect: %s", e)
             raise ConnectionError(f"Failed to connect: {e}")
 
+    def _touch(self) -> None:
+        """Record link activity and make sure the idle watchdog is running."""
+        self._last_write = asyncio.get_running_loop().time()
+        if self.keepalive_seconds is None:
+            return
+        if self._idle_disconnect_task is None or self._idle_disconnect_task.done():
+            self._idle_disconnect_task = asyncio.ensure_future(self._idle_watchdog())
+
+    async def _idle_watchdog(self) -> None:
+        """Disconnect once no write has happened for keepalive_seconds."""
+        loop = asyncio.get_running_loop()
+        while self.is_connected:
+            remaining = self._last_write + self.keepalive_seconds - loop.time()
+            if remaining <= 0:
+                logger.info(
+                    "No writes for %s seconds. Releasing connection.",
+                    self.keepalive_seconds,
+                )
+                await self.disconnect()
+                return
+            await asyncio.sleep(remaining)
+
     async def disconnect(self) -> None:
-        """Disconnect from the current device."""
-        if self.client and self.is_connected:
-            try:
-                await self.client.disconnect()
-                logger.info("Disconnected from RC car.")
-            except Exception as e:
-                logger.warning(f"Error during disconnect: {e}")
-            finally:
-                self._is_connected = False
-                self.client = None
-                self.device = None
+        """Disconnect from the current device, keeping the client for reconnects."""
+        task = self._idle_disconnect_task
+        if task is not None and task is not asyncio.current_task():
+            task.cancel()
+        self._idle_disconnect_task = None
+
+        try:
+            if self.client and self.is_connected:
+                try:
+                    await self.client.disconnect()
+                    logger.info("Disconnected from RC car.")
+                except Exception as e:
+                    logger.warning("Error during disconnect: %s", e)
+        finally:
+            # Also runs when the link was already lost, so no stale device or
+            # characteristic outlives the connection
+            self._reset_link_state()
 
-    async def write_characteristic(self, data: bytes) -> None:
+    async def write_characteristic(self, data: bytes, confirmed: bool = False) -> None:
         """
         Write data to the write characteristic.
 
+        Writes from concurrent tasks are serialized and sent in call order.
+
         Args:
             data: Data bytes to write (must be 16 bytes)
+            confirmed: Wait for the car to acknowledge the write, if the
+                characteristic supports it. Control frames leave this off.
 
         Raises:
             ConnectionError: If not connected
@@ -169,11 +386,21 @@ class BLEClient:
         if len(data) != 16:
             raise ValueError(f"Data must be exactly 16 bytes, got {len(data)}")
 
-        try:
-            await self.client.write_gatt_char(WRITE_CHAR_UUID, data)
-        except Exception as e:
-            logger.error(f"Failed to write characteristic: {e}")
-            raise
+        # One GATT write in flight at a time, so a stop() cannot be overtaken
+        # by a control frame that was issued first but is still being sent
+        if self._write_lock is None:
+            self._write_lock = asyncio.Lock()
+        async with self._write_lock:
+            try:
+                await self.client.write_gatt_char(
+                    self._write_char,
+                    data,
+                    response=self._confirmed_response if confirmed else self._write_response,
+                )
+            except Exception as e:
+                logger.error("Failed to write characteristic: %s", e)
+                raise
+        self._touch()
 
     async def __aenter__(self):
         """Async context manager entry."""
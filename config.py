@@ -1,7 +1,7 @@
 """Configuration management for Shell Motorsport RC Car library."""
 import os
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 # Default speed profiles
 DEFAULT_SPEED_PROFILES: Dict[str, int] = {
@@ -18,6 +18,9 @@ DEFAULT_SPEED: int = 0x50
 SERVICE_UUID: str = "fff0"
 WRITE_CHAR_UUID: str = "d44bc439-abfd-45a2-b575-925416129600"
 NOTIFY_CHAR_UUID: str = "d44bc439-abfd-45a2-b575-925416129601"
+# Advertised services the OS scanner filters on before results reach Python;
+# scans fall back to name matching when no car advertises them
+SCAN_SERVICE_UUIDS: List[str] = [SERVICE_UUID]
 
 # AES Encryption Key
 AES_KEY: bytes = bytes.fromhex("34522a5b7a6e492c08090a9d8d2a23f8")
@@ -34,9 +37,22 @@ CAR_COMMANDS_FILE: Path = Path(
 
 # Connection settings
 SCAN_TIMEOUT: float = 10.0  # seconds
+# Window for the service-filtered pass before scanning by name only
+FILTERED_SCAN_TIMEOUT: float = 2.0  # seconds
 CONNECTION_TIMEOUT: float = 10.0  # seconds
 MAX_SCAN_RETRIES: int = 5
-SCAN_RETRY_DELAY: float = 2.0  # seconds
+SCAN_RETRY_DELAY: float = 2.0  # seconds, upper bound for the retry backoff
+SCAN_RETRY_BASE_DELAY: float = 0.25  # seconds, first retry delay (doubles per attempt)
+DEVICE_CACHE_SECONDS: float = 10.0  # seconds a scanned car is reused without rescanning
+# Idle time before an unused connection is released (None keeps it open)
+KEEPALIVE_SECONDS: Optional[float] = None
+
+# Command stream settings
+COMMAND_INTERVAL: float = 0.02  # seconds between control frame ticks
+COMMAND_REFRESH_INTERVAL: float = 0.1  # seconds before an unchanged frame is resent
+# Seconds between frames of a timed move_forward/move_backward; kept below
+# COMMAND_INTERVAL so a move with a duration holds the link like a stream would
+MOVE_REPEAT_INTERVAL: float = 0.01
 
 # JoyCon settings
 JOYCON_DEADZONE: float = 0.02  # Analog stick deadzone threshold (2% to allow small movements)
@@ -1,6 +1,6 @@
 """AES encryption module for RC car messages."""
 from Crypto.Cipher import AES
-from typing import Optional
+from typing import Dict, Optional
 import logging
 
 logger = logging.getLogger(__name__)
@@ -9,6 +9,12 @@ logger = logging.getLogger(__name__)
 class MessageEncryptor:
     """Handles AES encryption for RC car control messages."""
 
+    __slots__ = ("key", "_cipher", "_cache")
+
+    # Control frames only vary in 4 flags and a speed byte, so the set of
+    # distinct plaintexts is small; cap the memo anyway for arbitrary input.
+    MAX_CACHE_SIZE: int = 4096
+
     def __init__(self, key: bytes):
         """
         Initialize the encryptor with an AES key.
@@ -19,6 +25,9 @@ class MessageEncryptor:
         if len(key) != 16:
             raise ValueError("AES key must be 16 bytes long")
         self.key = key
+        # ECB keeps no state between blocks, so one cipher can be reused
+        self._cipher = AES.new(key, AES.MODE_ECB)
+        self._cache: Dict[bytes, bytes] = {}
 
     def encrypt(self, message: bytes) -> bytes:
         """
@@ -36,10 +45,49 @@ class MessageEncryptor:
         if len(message) != 16:
             raise ValueError(f"Message must be exactly 16 bytes, got {len(message)}")
         try:
-            cipher = AES.new(self.key, AES.MODE_ECB)
-            return cipher.encrypt(message)
+            return self._encrypt_unchecked(bytes(message))
+        except Exception as e:
+            logger.error("Encryption failed: %s", e)
+            raise
+
+    def _encrypt_unchecked(self, message: bytes) -> bytes:
+        """
+        Encrypt a frame built by the library itself, skipping validation.
+
+        Args:
+            message: Plaintext bytes, already known to be exactly 16 bytes
+
+        Returns:
+            Encrypted message bytes
+        """
+        encrypted = self._cache.get(message)
+        if encrypted is None:
+            encrypted = self._cipher.encrypt(message)
+            if len(self._cache) < self.MAX_CACHE_SIZE:
+                self._cache[message] = encrypted
+        return encrypted
+
+    def encrypt_many(self, blocks: bytes) -> bytes:
+        """
+        Encrypt several concatenated 16-byte blocks in a single AES call.
+
+        Args:
+            blocks: Plaintext blocks laid out back to back (multiple of 16 bytes)
+
+        Returns:
+            Encrypted blocks in the same order
+
+        Raises:
+            ValueError: If blocks length is not a multiple of 16 bytes
+        """
+        if len(blocks) % 16 != 0:
+            raise ValueError(
+                f"Blocks must be a multiple of 16 bytes, got {len(blocks)}"
+            )
+        try:
+            return self._cipher.encrypt(blocks)
         except Exception as e:
-            logger.error(f"Encryption failed: {e}")
+            logger.error("Encryption failed: %s", e)
             raise
 
     def decrypt(self, encrypted_message: bytes) -> Optional[bytes]:
@@ -60,9 +108,8 @@ class MessageEncryptor:
                 f"Encrypted message must be exactly 16 bytes, got {len(encrypted_message)}"
             )
         try:
-            cipher = AES.new(self.key, AES.MODE_ECB)
-            return cipher.decrypt(encrypted_message)
+            return self._cipher.decrypt(encrypted_message)
         except Exception as e:
-            logger.error(f"Decryption failed: {e}")
+            logger.error("Decryption failed: %s", e)
             return None
 
@@ -1,6 +1,8 @@
 """JoyCon handler module for RC car control."""
+import asyncio
 import logging
-from typing import Dict, Optional, Tuple
+from operator import itemgetter
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
 
 # Handle both package and direct script execution
 try:
@@ -11,10 +13,82 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Nested stick layouts seen across pyjoycon builds, in probe order:
+# (group key, candidate x keys, candidate y keys)
+_STICK_LAYOUTS: Tuple[Tuple[str, Tuple[str, ...], Tuple[str, ...]], ...] = (
+    ("analogs", ("x", "stick_x", "horizontal"), ("y", "stick_y", "vertical")),
+    ("analog-sticks", ("x", "horizontal", "stick_x"), ("y", "vertical", "stick_y")),
+    ("stick", ("x", "horizontal"), ("y", "vertical")),
+)
+
+# Resolved stick location: (group key or None for flat, x key, y key,
+# x scale, y scale, getter returning (x, y) when both keys are present)
+StickLayout = Tuple[
+    Optional[str], Optional[str], Optional[str], float, float, Optional[Callable]
+]
+
+# Scale for builds reporting raw integers in the -32768..32767 range
+_INT_AXIS_SCALE: float = 1.0 / 32768.0
+
+# Top-level status keys used by pyjoycon builds that flatten the sticks
+_FLAT_STICK_KEYS: Dict[str, Tuple[str, str]] = {
+    "right": ("right_stick_x", "right_stick_y"),
+    "left": ("left_stick_x", "left_stick_y"),
+}
+
+# Which side of the status dict each JoyCon reports under
+_DEVICE_SIDES: Dict[str, str] = {"Plus": "right", "Minus": "left"}
+
+# Speed profile values bound once at import
+_SPEED_LOW: int = DEFAULT_SPEED_PROFILES["low"]
+_SPEED_MEDIUM: int = DEFAULT_SPEED_PROFILES["medium"]
+_SPEED_HIGH: int = DEFAULT_SPEED_PROFILES["high"]
+_SPEED_MAX: int = DEFAULT_SPEED_PROFILES["max"]
+
+
+def _build_speed_lut(speeds: Tuple[int, int, int, int]) -> Tuple[Optional[int], ...]:
+    """Map every 4-bit speed button mask to the speed of its lowest set bit."""
+    lut: List[Optional[int]] = [None]
+    for mask in range(1, 16):
+        lut.append(speeds[(mask & -mask).bit_length() - 1])
+    return tuple(lut)
+
+
+# Speed per button mask; bit 0 is the low speed button, bit 3 the max one.
+# When several buttons are held the lowest speed wins.
+_SPEED_LUT: Tuple[Optional[int], ...] = _build_speed_lut(
+    (_SPEED_LOW, _SPEED_MEDIUM, _SPEED_HIGH, _SPEED_MAX)
+)
+
+# Speed buttons per JoyCon: (side, (low, medium, high, max) button names)
+_SPEED_BUTTONS: Dict[str, Tuple[str, Tuple[str, str, str, str]]] = {
+    "Plus": ("right", ("a", "b", "y", "x")),
+    "Minus": ("left", ("left", "down", "right", "up")),
+}
+
+
+class _CenterCalibration:
+    """Center calibration state for one JoyCon's offset Y-axis."""
+
+    __slots__ = ("y_center", "y_min", "y_max", "sample_count", "calibrated")
+
+    def __init__(self):
+        self.y_center: Optional[float] = None
+        self.y_min = float('inf')
+        self.y_max = float('-inf')
+        self.sample_count = 0
+        self.calibrated = False
+
 
 class JoyConHandler:
     """Handles JoyCon input processing for RC car control."""
 
+    __slots__ = (
+        "default_speed",
+        "_calibrations",
+        "_stick_layouts",
+    )
+
     def __init__(self, default_speed: int = DEFAULT_SPEED):
         """
         Initialize the JoyCon handler.
@@ -23,12 +97,25 @@ class JoyConHandler:
             default_speed: Default speed value to use
         """
         self.default_speed = default_speed
-        # Track center position for offset axes (e.g., rotated JoyCon Y-axis)
-        self._y_center = None
-        self._y_min = float('inf')
-        self._y_max = float('-inf')
-        self._center_samples = []
-        self._center_calibrated = False
+        # Center position per side for offset axes (e.g., rotated JoyCon
+        # Y-axis), so JoyCons sharing a handler calibrate independently
+        self._calibrations: Dict[str, _CenterCalibration] = {}
+        # Stick layout per side, resolved from the first status seen
+        self._stick_layouts: Dict[str, StickLayout] = {}
+
+    def _calibration(self, side: str) -> _CenterCalibration:
+        """Get the center calibration state for one side, creating it on first use."""
+        calibration = self._calibrations.get(side)
+        if calibration is None:
+            calibration = self._calibrations[side] = _CenterCalibration()
+        return calibration
+
+    def _center_info(self, side: str) -> str:
+        """Describe the calibrated Y-axis center for steering log lines."""
+        calibration = self._calibrations.get(side)
+        if calibration is None or not calibration.y_center:
+            return ""
+        return f", center={calibration.y_center:.3f}"
 
     def _apply_deadzone(self, value: float, deadzone: float = JOYCON_DEADZONE) -> float:
         """
@@ -45,32 +132,38 @@ class JoyConHandler:
             return 0.0
         return value
 
-    def _update_center_calibration(self, y_value: float, max_samples: int = 100):
+    def _update_center_calibration(
+        self, y_value: float, side: str = "right", max_samples: int = 100
+    ):
         """
         Update center position calibration for offset axes.
 
         Args:
             y_value: Current Y-axis value
+            side: "right" or "left", the JoyCon the value came from
             max_samples: Maximum number of samples to collect before calculating center
         """
+        calibration = self._calibration(side)
+        # The center is fixed once calibrated
+        if calibration.calibrated:
+            return
+
         if y_value != 0.0:
-            self._y_min = min(self._y_min, y_value)
-            self._y_max = max(self._y_max, y_value)
-            self._center_samples.append(y_value)
-
-            # Calculate center after collecting enough samples
-            if len(self._center_samples) >= max_samples and not self._center_calibrated:
-                # Use average of min/max as center, or median of samples
-                if self._y_min != float('inf') and self._y_max != float('-inf'):
-                    self._y_center = (self._y_min + self._y_max) / 2.0
-                    self._center_calibrated = True
-                    logger.info(f"[CALIBRATION] Y-axis center calibrated: {self._y_center:.3f} (range: {self._y_min:.3f} to {self._y_max:.3f})")
-                else:
-                    # Fallback: use median of samples
-                    sorted_samples = sorted(self._center_samples)
-                    self._y_center = sorted_samples[len(sorted_samples) // 2]
-                    self._center_calibrated = True
-                    logger.info(f"[CALIBRATION] Y-axis center calibrated (median): {self._y_center:.3f}")
+            # Only the running range is needed, so samples are counted, not kept
+            if y_value < calibration.y_min:
+                calibration.y_min = y_value
+            if y_value > calibration.y_max:
+                calibration.y_max = y_value
+            calibration.sample_count += 1
+
+            # Use the middle of the observed range after enough samples
+            if calibration.sample_count >= max_samples:
+                calibration.y_center = (calibration.y_min + calibration.y_max) / 2.0
+                calibration.calibrated = True
+                logger.info(
+                    "[CALIBRATION] %s Y-axis center calibrated: %.3f (range: %.3f to %.3f)",
+                    side, calibration.y_center, calibration.y_min, calibration.y_max,
+                )
 
     def _get_steering_from_offset_axis(self, axis_value: float, center: float, threshold: float = JOYCON_DEADZONE) -> Tuple[int, int]:
         """
@@ -101,6 +194,132 @@ class JoyConHandler:
 
         return (left, right)
 
+    def _resolve_stick_layout(self, status: Dict, side: str) -> Optional[StickLayout]:
+        """
+        Find where this pyjoycon build puts one analog stick.
+
+        The value type is checked here too: builds that report raw integers
+        get a scale that maps -32768..32767 onto -1.0..1.0, so reads need no
+        per-frame type check.
+
+        Args:
+            status: JoyCon status dictionary
+            side: "right" or "left"
+
+        Returns:
+            Tuple of (group key, x key, y key, x scale, y scale, getter),
+            where group is None for flat layouts, a missing axis key is None
+            and getter is an itemgetter for both axes (None unless both keys
+            exist); or None if no stick found
+        """
+        for group, x_keys, y_keys in _STICK_LAYOUTS:
+            if group in status and side in status[group]:
+                stick = status[group][side]
+                x_key = next((key for key in x_keys if key in stick), None)
+                y_key = next((key for key in y_keys if key in stick), None)
+                break
+        else:
+            group = None
+            stick = status
+            flat_x, flat_y = _FLAT_STICK_KEYS[side]
+            if flat_x not in status and flat_y not in status:
+                return None
+            x_key = flat_x if flat_x in status else None
+            y_key = flat_y if flat_y in status else None
+
+        x_scale = _INT_AXIS_SCALE if x_key is not None and isinstance(stick[x_key], int) else 1.0
+        y_scale = _INT_AXIS_SCALE if y_key is not None and isinstance(stick[y_key], int) else 1.0
+        both = itemgetter(x_key, y_key) if x_key is not None and y_key is not None else None
+        return (group, x_key, y_key, x_scale, y_scale, both)
+
+    def read_stick(self, status: Dict, side: str) -> Tuple[float, float]:
+        """
+        Read one analog stick from a JoyCon status as normalized floats.
+
+        pyjoycon versions disagree on where the stick lives, so the layout is
+        resolved on first use and cached per side; it is re-resolved once if
+        a cached key disappears.
+
+        Args:
+            status: JoyCon status dictionary
+            side: "right" or "left"
+
+        Returns:
+            Tuple of (x, y) stick values, or (0.0, 0.0) if the stick cannot
+            be read from this status
+        """
+        layout = self._stick_layouts.get(side)
+        cached = layout is not None
+        if not cached:
+            layout = self._resolve_stick_layout(status, side)
+            if layout is None:
+                return (0.0, 0.0)
+            self._stick_layouts[side] = layout
+
+        group, x_key, y_key, x_scale, y_scale, both = layout
+        try:
+            stick = status[group][side] if group is not None else status
+            if both is not None:
+                analog_x, analog_y = both(stick)
+                return (analog_x * x_scale, analog_y * y_scale)
+            analog_x = stick[x_key] * x_scale if x_key is not None else 0.0
+            analog_y = stick[y_key] * y_scale if y_key is not None else 0.0
+        except (KeyError, TypeError):
+            del self._stick_layouts[side]
+            if not cached:
+                # A freshly resolved layout failed too, so the axis values
+                # themselves are unusable (e.g. None); report a centered stick
+                return (0.0, 0.0)
+            # Status shape changed under us; resolve again from scratch
+            return self.read_stick(status, side)
+
+        return (analog_x, analog_y)
+
+    def _get_steering(
+        self, analog_x: float, analog_y: float, rotated: bool, side: str = "right"
+    ) -> Tuple[int, int, str, float]:
+        """
+        Turn stick readings into left/right steering flags.
+
+        Args:
+            analog_x: Normalized stick X value
+            analog_y: Normalized stick Y value
+            rotated: Whether the JoyCon is rotated (single controller mode).
+                    When True, uses y-axis as horizontal steering axis.
+            side: "right" or "left", selecting the center calibration to use
+
+        Returns:
+            Tuple of (left, right, axis name, raw axis value) for logging
+        """
+        if not rotated:
+            # Normal orientation: use x-axis for horizontal steering
+            steering_axis = self._apply_deadzone(analog_x)
+            return (
+                1 if steering_axis < 0 else 0,
+                1 if steering_axis > 0 else 0,
+                "X (normal)",
+                analog_x,
+            )
+
+        # When rotated, Y-axis is horizontal but has offset (always positive)
+        self._update_center_calibration(analog_y, side)
+
+        if analog_x < 0:
+            # X-axis has negative values (better for left turns), use it for steering
+            steering_axis = self._apply_deadzone(analog_x)
+            return (
+                1 if steering_axis < 0 else 0,
+                1 if steering_axis > 0 else 0,
+                "X (has negative values)",
+                analog_x,
+            )
+
+        # Use Y-axis with center-relative comparison for the offset axis
+        left, right = self._get_steering_from_offset_axis(
+            analog_y, self._calibrations[side].y_center
+        )
+        return (left, right, "Y (rotated, offset)", analog_y)
+
     def _get_speed_from_buttons(
         self, status: Dict, device_type: str
     ) -> Optional[int]:
@@ -114,29 +333,24 @@ class JoyConHandler:
         Returns:
             Speed value or None if no speed button pressed
         """
+        mapping = _SPEED_BUTTONS.get(device_type)
+        if mapping is None:
+            return None
+
+        side, (low, medium, high, top) = mapping
         try:
-            if device_type == "Plus":
-                if status["buttons"]["right"]["a"]:
-                    return DEFAULT_SPEED_PROFILES["low"]
-                elif status["buttons"]["right"]["b"]:
-                    return DEFAULT_SPEED_PROFILES["medium"]
-                elif status["buttons"]["right"]["y"]:
-                    return DEFAULT_SPEED_PROFILES["high"]
-                elif status["buttons"]["right"]["x"]:
-                    return DEFAULT_SPEED_PROFILES["max"]
-            elif device_type == "Minus":
-                if status["buttons"]["left"]["left"]:
-                    return DEFAULT_SPEED_PROFILES["low"]
-                elif status["buttons"]["left"]["down"]:
-                    return DEFAULT_SPEED_PROFILES["medium"]
-                elif status["buttons"]["left"]["right"]:
-                    return DEFAULT_SPEED_PROFILES["high"]
-                elif status["buttons"]["left"]["up"]:
-                    return DEFAULT_SPEED_PROFILES["max"]
+            buttons = status["buttons"][side]
+            mask = (
+                (1 if buttons[low] else 0)
+                | (2 if buttons[medium] else 0)
+                | (4 if buttons[high] else 0)
+                | (8 if buttons[top] else 0)
+            )
         except (KeyError, TypeError) as e:
-            logger.debug(f"Error reading speed buttons: {e}")
+            logger.debug("Error reading speed buttons: %s", e)
+            return None
 
-        return None
+        return _SPEED_LUT[mask]
 
     def parse_joycon_status(
         self, status: Dict, device_type: str = "Plus", current_speed: int = DEFAULT_SPEED, rotated: bool = False
@@ -166,202 +380,96 @@ class JoyConHandler:
             if speed_override is not None:
                 speed = speed_override
 
-            if device_type == "Plus":
-                # Right JoyCon controls
-                forward = 1 if status.get("buttons", {}).get("right", {}).get("sr", False) else 0
-                backward = (
-                    1 if status.get("buttons", {}).get("right", {}).get("sl", False) else 0
-                )
+            side = _DEVICE_SIDES.get(device_type)
+            if side is not None:
+                # Missing keys raise KeyError, handled below
+                buttons = status["buttons"][side]
+                forward = 1 if buttons["sr"] else 0
+                backward = 1 if buttons["sl"] else 0
 
                 # Analog stick for steering
                 # For rotated single JoyCon: y-axis becomes horizontal (when rotated 90°)
                 # For normal orientation: x-axis is horizontal
-
-                # Try multiple possible structures for analog values
-                analog_x_raw = 0.0
-                analog_y_raw = 0.0
-
-                # Try different possible structures
-                if "analogs" in status and "right" in status["analogs"]:
-                    analogs_right = status["analogs"]["right"]
-                    analog_x_raw = analogs_right.get("x", analogs_right.get("stick_x", analogs_right.get("horizontal", 0.0)))
-                    analog_y_raw = analogs_right.get("y", analogs_right.get("stick_y", analogs_right.get("vertical", 0.0)))
-                elif "analog-sticks" in status and "right" in status["analog-sticks"]:
-                    stick_right = status["analog-sticks"]["right"]
-                    analog_x_raw = stick_right.get("x", stick_right.get("horizontal", stick_right.get("stick_x", 0.0)))
-                    analog_y_raw = stick_right.get("y", stick_right.get("vertical", stick_right.get("stick_y", 0.0)))
-                elif "stick" in status and "right" in status["stick"]:
-                    stick_right = status["stick"]["right"]
-                    analog_x_raw = stick_right.get("x", stick_right.get("horizontal", 0.0))
-                    analog_y_raw = stick_right.get("y", stick_right.get("vertical", 0.0))
-                elif "right_stick_x" in status or "right_stick_y" in status:
-                    analog_x_raw = status.get("right_stick_x", 0.0)
-                    analog_y_raw = status.get("right_stick_y", 0.0)
-
-                # Handle raw integer values (pyjoycon might return integers that need normalization)
-                if isinstance(analog_x_raw, int):
-                    # Normalize from -32768 to 32767 range to -1.0 to 1.0
-                    analog_x_raw = analog_x_raw / 32768.0 if analog_x_raw != 0 else 0.0
-                if isinstance(analog_y_raw, int):
-                    # Normalize from -32768 to 32767 range to -1.0 to 1.0
-                    analog_y_raw = analog_y_raw / 32768.0 if analog_y_raw != 0 else 0.0
-
-                # Debug: Log all available keys
-                if logger.isEnabledFor(logging.INFO):
-                    if "analogs" in status:
-                        logger.info(f"[AXIS DEBUG] Available in status['analogs']: {list(status['analogs'].keys())}")
-                    if "analog-sticks" in status:
-                        logger.info(f"[AXIS DEBUG] Available in status['analog-sticks']: {list(status['analog-sticks'].keys())}")
-                    if "stick" in status:
-                        logger.info(f"[AXIS DEBUG] Available in status['stick']: {list(status['stick'].keys())}")
-
-                if rotated:
-                    # When rotated, Y-axis is horizontal but has offset (always positive)
-                    # Update center calibration
-                    self._update_center_calibration(analog_y_raw)
-
-                    # Check if X-axis has negative values (could be better for left turns)
-                    if analog_x_raw < 0:
-                        # X-axis has negative values, use it for steering
-                        steering_axis = analog_x_raw
-                        axis_name = "X (has negative values)"
-                        steering_axis_raw = steering_axis
-                        steering_axis = self._apply_deadzone(steering_axis)
-                        left = 1 if steering_axis < 0 else 0
-                        right = 1 if steering_axis > 0 else 0
-                    else:
-                        # Use Y-axis with center-relative comparison
-                        steering_axis = analog_y_raw
-                        axis_name = "Y (rotated, offset)"
-                        steering_axis_raw = steering_axis
-                        # Use center-relative comparison for offset axis
-                        left, right = self._get_steering_from_offset_axis(analog_y_raw, self._y_center)
-                        steering_axis = analog_y_raw - (self._y_center if self._y_center else 0.057)  # For logging
-                else:
-                    # Normal orientation: use x-axis for horizontal steering
-                    steering_axis = analog_x_raw
-                    axis_name = "X (normal)"
-                    steering_axis_raw = steering_axis
-                    steering_axis = self._apply_deadzone(steering_axis)
-                    left = 1 if steering_axis < 0 else 0
-                    right = 1 if steering_axis > 0 else 0
-
-                # Log steering info - more detailed when values pass deadzone
-                if left or right:
-                    # Steering command will be generated
-                    center_info = f", center={self._y_center:.3f}" if self._y_center else ""
-                    logger.info(
-                        f"[STEERING ACTIVE] Plus JoyCon - "
-                        f"X={analog_x_raw:.3f}, Y={analog_y_raw:.3f}{center_info}, "
-                        f"Using {axis_name}={steering_axis_raw:.3f}, "
-                        f"left={left}, right={right}, rotated={rotated}"
-                    )
-                elif abs(steering_axis_raw) > 0.01 or abs(analog_y_raw) > 0.01:
-                    # Value detected but no steering command
-                    center_info = f", center={self._y_center:.3f}" if self._y_center else ""
-                    logger.debug(
-                        f"[STEERING FILTERED] Plus JoyCon - "
-                        f"X={analog_x_raw:.3f}, Y={analog_y_raw:.3f}{center_info}, "
-                        f"Using {axis_name}={steering_axis_raw:.3f}, "
-                        f"left={left}, right={right}"
-                    )
-
-            elif device_type == "Minus":
-                # Left JoyCon controls
-                forward = (
-                    1 if status.get("buttons", {}).get("left", {}).get("sr", False) else 0
-                )
-                backward = (
-                    1 if status.get("buttons", {}).get("left", {}).get("sl", False) else 0
+                analog_x_raw, analog_y_raw = self.read_stick(status, side)
+
+                # Debug: Log all available keys (building the key lists is
+                # only worth it when debug output is actually wanted)
+                if logger.isEnabledFor(logging.DEBUG):
+                    for group in ("analogs", "analog-sticks", "stick"):
+                        if group in status:
+                            logger.debug(
+                                "[AXIS DEBUG] Available in status['%s']: %s",
+                                group, list(status[group].keys()),
+                            )
+
+                left, right, axis_name, steering_axis_raw = self._get_steering(
+                    analog_x_raw, analog_y_raw, rotated, side
                 )
 
-                # Analog stick for steering
-                # For rotated single JoyCon: y-axis becomes horizontal (when rotated 90°)
-                # For normal orientation: x-axis is horizontal
-
-                # Try multiple possible structures for analog values
-                analog_x_raw = 0.0
-                analog_y_raw = 0.0
-
-                # Try different possible structures
-                if "analogs" in status and "left" in status["analogs"]:
-                    analogs_left = status["analogs"]["left"]
-                    analog_x_raw = analogs_left.get("x", analogs_left.get("stick_x", analogs_left.get("horizontal", 0.0)))
-                    analog_y_raw = analogs_left.get("y", analogs_left.get("stick_y", analogs_left.get("vertical", 0.0)))
-                elif "analog-sticks" in status and "left" in status["analog-sticks"]:
-                    stick_left = status["analog-sticks"]["left"]
-                    analog_x_raw = stick_left.get("x", stick_left.get("horizontal", stick_left.get("stick_x", 0.0)))
-                    analog_y_raw = stick_left.get("y", stick_left.get("vertical", stick_left.get("stick_y", 0.0)))
-                elif "stick" in status and "left" in status["stick"]:
-                    stick_left = status["stick"]["left"]
-                    analog_x_raw = stick_left.get("x", stick_left.get("horizontal", 0.0))
-                    analog_y_raw = stick_left.get("y", stick_left.get("vertical", 0.0))
-                elif "left_stick_x" in status or "left_stick_y" in status:
-                    analog_x_raw = status.get("left_stick_x", 0.0)
-                    analog_y_raw = status.get("left_stick_y", 0.0)
-
-                # Handle raw integer values (pyjoycon might return integers that need normalization)
-                if isinstance(analog_x_raw, int):
-                    # Normalize from -32768 to 32767 range to -1.0 to 1.0
-                    analog_x_raw = analog_x_raw / 32768.0 if analog_x_raw != 0 else 0.0
-                if isinstance(analog_y_raw, int):
-                    # Normalize from -32768 to 32767 range to -1.0 to 1.0
-                    analog_y_raw = analog_y_raw / 32768.0 if analog_y_raw != 0 else 0.0
-
-                if rotated:
-                    # When rotated, Y-axis is horizontal but has offset (always positive)
-                    # Update center calibration
-                    self._update_center_calibration(analog_y_raw)
-
-                    # Check if X-axis has negative values (could be better for left turns)
-                    if analog_x_raw < 0:
-                        # X-axis has negative values, use it for steering
-                        steering_axis = analog_x_raw
-                        axis_name = "X (has negative values)"
-                        steering_axis_raw = steering_axis
-                        steering_axis = self._apply_deadzone(steering_axis)
-                        left = 1 if steering_axis < 0 else 0
-                        right = 1 if steering_axis > 0 else 0
-                    else:
-                        # Use Y-axis with center-relative comparison
-                        steering_axis = analog_y_raw
-                        axis_name = "Y (rotated, offset)"
-                        steering_axis_raw = steering_axis
-                        # Use center-relative comparison for offset axis
-                        left, right = self._get_steering_from_offset_axis(analog_y_raw, self._y_center)
-                        steering_axis = analog_y_raw - (self._y_center if self._y_center else 0.057)  # For logging
-                else:
-                    # Normal orientation: use x-axis for horizontal steering
-                    steering_axis = analog_x_raw
-                    axis_name = "X (normal)"
-                    steering_axis_raw = steering_axis
-                    steering_axis = self._apply_deadzone(steering_axis)
-                    left = 1 if steering_axis < 0 else 0
-                    right = 1 if steering_axis > 0 else 0
-
                 # Log steering info - more detailed when values pass deadzone
                 if left or right:
                     # Steering command will be generated
-                    center_info = f", center={self._y_center:.3f}" if self._y_center else ""
-                    logger.info(
-                        f"[STEERING ACTIVE] Minus JoyCon - "
-                        f"X={analog_x_raw:.3f}, Y={analog_y_raw:.3f}{center_info}, "
-                        f"Using {axis_name}={steering_axis_raw:.3f}, "
-                        f"left={left}, right={right}, rotated={rotated}"
-                    )
-                elif abs(steering_axis_raw) > 0.01 or abs(analog_y_raw) > 0.01:
+                    if logger.isEnabledFor(logging.INFO):
+                        logger.info(
+                            "[STEERING ACTIVE] %s JoyCon - X=%.3f, Y=%.3f%s, "
+                            "Using %s=%.3f, left=%d, right=%d, rotated=%s",
+                            device_type, analog_x_raw, analog_y_raw, self._center_info(side),
+                            axis_name, steering_axis_raw, left, right, rotated,
+                        )
+                elif logger.isEnabledFor(logging.DEBUG) and (
+                    abs(steering_axis_raw) > 0.01 or abs(analog_y_raw) > 0.01
+                ):
                     # Value detected but no steering command
-                    center_info = f", center={self._y_center:.3f}" if self._y_center else ""
                     logger.debug(
-                        f"[STEERING FILTERED] Minus JoyCon - "
-                        f"X={analog_x_raw:.3f}, Y={analog_y_raw:.3f}{center_info}, "
-                        f"Using {axis_name}={steering_axis_raw:.3f}, "
-                        f"left={left}, right={right}"
+                        "[STEERING FILTERED] %s JoyCon - X=%.3f, Y=%.3f%s, "
+                        "Using %s=%.3f, left=%d, right=%d",
+                        device_type, analog_x_raw, analog_y_raw, self._center_info(side),
+                        axis_name, steering_axis_raw, left, right,
                     )
 
         except (KeyError, TypeError) as e:
-            logger.error(f"Error parsing JoyCon status: {e}")
+            logger.error("Error parsing JoyCon status: %s", e)
             return (0, 0, 0, 0, current_speed)
 
         return (forward, backward, left, right, speed)
 
+
+async def iter_joycon_status(joycon: Any) -> AsyncIterator[Dict]:
+    """
+    Yield JoyCon statuses as the controller reports them.
+
+    pyjoycon reads HID reports on its own thread. A hook registered there
+    hands each new status to the event loop, so the caller wakes on input
+    instead of polling on a timer. If the caller falls behind, only the
+    newest status is kept.
+
+    Args:
+        joycon: pyjoycon JoyCon instance
+
+    Yields:
+        JoyCon status dictionaries
+    """
+    loop = asyncio.get_running_loop()
+    updated = asyncio.Event()
+    latest: List[Optional[Dict]] = [None]
+    active = True
+
+    def on_report(source: Any) -> None:
+        if not active:
+            return
+        # Overwrite rather than queue, so a slow consumer never sees a backlog
+        latest[0] = source.get_status()
+        try:
+            loop.call_soon_threadsafe(updated.set)
+        except RuntimeError:
+            # Event loop already closed
+            pass
+
+    joycon.register_update_hook(on_report)
+    try:
+        while True:
+            await updated.wait()
+            updated.clear()
+            yield latest[0]
+    finally:
+        active = False
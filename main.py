@@ -17,10 +17,15 @@ async def execute_continuous_move(
         duration: Duration in seconds
         interval: Interval between commands in seconds
     """
-    end_time = asyncio.get_event_loop().time() + duration
-    while asyncio.get_event_loop().time() < end_time:
-        await car.move_command(message)
-        await asyncio.sleep(interval)
+    # A one-shot timer ends the move instead of reading the clock every tick
+    done = asyncio.Event()
+    timer = asyncio.get_running_loop().call_later(duration, done.set)
+    try:
+        while not done.is_set():
+            await car.move_command(message)
+            await asyncio.sleep(interval)
+    finally:
+        timer.cancel()
 
 
 async def main() -> None:
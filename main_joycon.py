@@ -1,6 +1,7 @@
 """Example script for controlling RC cars with JoyCon controllers."""
 import asyncio
-from shell_motorsport import ShellMotorsportCar
+from shell_motorsport import JoyConHandler, ShellMotorsportCar
+from joycon_handler import iter_joycon_status
 from pyjoycon import JoyCon, get_R_id, get_L_id
 
 car_name_plus = "AMASETTI_F1_75_44"
@@ -12,56 +13,66 @@ joycon_minus = JoyCon(*get_L_id())
 
 async def main() -> None:
     """Main function demonstrating JoyCon control of RC cars."""
-    car_plus = ShellMotorsportCar()
-    car_minus = ShellMotorsportCar()
+    # One handler for both cars: stick layouts and calibration are kept per side
+    joycon_handler = JoyConHandler()
+    car_plus = ShellMotorsportCar(joycon_handler=joycon_handler)
+    car_minus = ShellMotorsportCar(joycon_handler=joycon_handler)
 
     try:
-        # Connect to cars by name
+        # Naming stays sequential so the second scan skips the car just named
         if car_name_plus not in car_plus.vehicle_list:
             await car_plus.find_and_name_car(car_name_plus)
-        await car_plus.connect_by_name(car_name_plus)
-
         if car_name_minus not in car_minus.vehicle_list:
             await car_minus.find_and_name_car(car_name_minus)
-        await car_minus.connect_by_name(car_name_minus)
-
-        # Current speed for each car (will be updated by JoyCon buttons)
-        speed_plus = 0x50
-        speed_minus = 0x50
 
-        async def update_status():
-            """Generator that yields JoyCon status updates."""
-            while True:
-                status_plus = joycon_plus.get_status()
-                status_minus = joycon_minus.get_status()
-                yield status_plus, status_minus
-                await asyncio.sleep(0.005)  # 5ms for better responsiveness
+        # Each car scans for its own device ID, so connecting can overlap
+        await asyncio.gather(
+            car_plus.connect_by_name(car_name_plus),
+            car_minus.connect_by_name(car_name_minus),
+        )
 
-        async for status_plus, status_minus in update_status():
-            # Get commands from JoyCons (speed is handled internally)
-            command_plus = car_plus.get_joycon_command(
-                status_plus, "Plus", speed_plus
-            )
-            command_minus = car_minus.get_joycon_command(
-                status_minus, "Minus", speed_minus
-            )
+        # Frames are sent on a fixed cadence; unchanged states are coalesced.
+        # Each car's stream is its own task, so the two BLE writes overlap.
+        await asyncio.gather(
+            car_plus.start_command_stream(), car_minus.start_command_stream()
+        )
 
-            # Update speed based on button presses
-            # (Speed is returned in the command, but we track it separately)
-            _, _, _, _, speed_plus = car_plus.joycon_handler.parse_joycon_status(
-                status_plus, "Plus", speed_plus
-            )
-            _, _, _, _, speed_minus = car_minus.joycon_handler.parse_joycon_status(
-                status_minus, "Minus", speed_minus
-            )
+        async def drive(car, joycon, device_type):
+            """Feed one car from its JoyCon whenever a new report arrives."""
+            # Current speed (will be updated by JoyCon buttons)
+            speed = 0x50
+            async for status in iter_joycon_status(joycon):
+                # Get the command along with the speed picked by the buttons
+                command, speed = car.get_joycon_command_and_speed(
+                    status, device_type, speed
+                )
+                # Raises once the car's stream has died, ending the session
+                car.set_command(command)
 
-            await car_plus.move_command(command_plus)
-            await car_minus.move_command(command_minus)
+        # Each JoyCon wakes only its own car's task, with no fixed polling
+        drivers = [
+            asyncio.ensure_future(drive(car_plus, joycon_plus, "Plus")),
+            asyncio.ensure_future(drive(car_minus, joycon_minus, "Minus")),
+        ]
+        try:
+            await asyncio.gather(*drivers)
+        finally:
+            for driver in drivers:
+                driver.cancel()
 
     finally:
-        await car_plus.disconnect()
-        await car_minus.disconnect()
+        # A failed disconnect on one car must not cut the other one short
+        await asyncio.gather(
+            car_plus.disconnect(), car_minus.disconnect(), return_exceptions=True
+        )
 
 
 if __name__ == "__main__":
+    try:
+        import uvloop
+    except ImportError:
+        pass
+    else:
+        # Optional libuv-based loop for the high-rate control loop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     asyncio.run(main())
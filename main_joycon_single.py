@@ -2,6 +2,7 @@
 import asyncio
 import sys
 import logging
+import time
 from pathlib import Path
 
 # Configure logging for debugging
@@ -14,8 +15,11 @@ logging.basicConfig(
 sys.path.insert(0, str(Path(__file__).parent))
 
 from shell_motorsport import ShellMotorsportCar
+from joycon_handler import iter_joycon_status
 from pyjoycon import JoyCon, get_R_id
 
+logger = logging.getLogger(__name__)
+
 car_name = "AMASETTI_F1_75"
 
 # Initialize Plus JoyCon (right controller)
@@ -31,6 +35,9 @@ async def main() -> None:
         if car_name not in car.vehicle_list:
             await car.find_and_name_car(car_name)
         await car.connect_by_name(car_name)
+        # Frames go out from their own task on a fixed cadence, so a slow BLE
+        # write never holds up JoyCon input; unchanged frames are coalesced
+        await car.start_command_stream()
 
         print(f"Connected to {car_name}. Use JoyCon Plus to control the car.")
         print("Controls (single rotated JoyCon):")
@@ -51,114 +58,90 @@ async def main() -> None:
         async def update_status():
             """Generator that yields JoyCon status updates."""
             first_status_logged = False
-            while True:
-                status = joycon_plus.get_status()
-
+            async for status in iter_joycon_status(joycon_plus):
                 # Log the structure of the status dict once for debugging
                 if not first_status_logged:
-                    print(f"[DEBUG] JoyCon status structure keys: {list(status.keys())}")
-                    print(f"[DEBUG] Full status structure (first 500 chars): {str(status)[:500]}")
-                    if "analogs" in status:
-                        print(f"[DEBUG] Analogs structure: {status['analogs']}")
-                    if "analog-sticks" in status:
-                        print(f"[DEBUG] Analog-sticks structure: {status['analog-sticks']}")
-                    if "stick" in status:
-                        print(f"[DEBUG] Stick structure: {status['stick']}")
-                    if "buttons" in status:
-                        print(f"[DEBUG] Buttons structure: {status['buttons']}")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("JoyCon status structure keys: %s", list(status.keys()))
+                        logger.debug("Full status structure (first 500 chars): %.500s", status)
+                        for group in ("analogs", "analog-sticks", "stick", "buttons"):
+                            if group in status:
+                                logger.debug("%s structure: %s", group, status[group])
                     first_status_logged = True
 
                 yield status
-                await asyncio.sleep(0.005)  # 5ms for better responsiveness
+
+        # Debug log rate limiting and Y-axis range tracking
+        last_log_time = 0.0
+        min_y = float('inf')
+        max_y = float('-inf')
 
         async for status in update_status():
-            # Debug: Try multiple possible structures for analog values
-            analog_x = 0.0
-            analog_y = 0.0
-
-            # Try different possible structures
-            if "analogs" in status and "right" in status["analogs"]:
-                analogs_right = status["analogs"]["right"]
-                analog_x = analogs_right.get("x", analogs_right.get("stick_x", analogs_right.get("horizontal", 0.0)))
-                analog_y = analogs_right.get("y", analogs_right.get("stick_y", analogs_right.get("vertical", 0.0)))
-            elif "analog-sticks" in status and "right" in status["analog-sticks"]:
-                stick_right = status["analog-sticks"]["right"]
-                analog_x = stick_right.get("x", stick_right.get("horizontal", stick_right.get("stick_x", 0.0)))
-                analog_y = stick_right.get("y", stick_right.get("vertical", stick_right.get("stick_y", 0.0)))
-            elif "stick" in status and "right" in status["stick"]:
-                stick_right = status["stick"]["right"]
-                analog_x = stick_right.get("x", stick_right.get("horizontal", 0.0))
-                analog_y = stick_right.get("y", stick_right.get("vertical", 0.0))
-            elif "right_stick_x" in status or "right_stick_y" in status:
-                analog_x = status.get("right_stick_x", 0.0)
-                analog_y = status.get("right_stick_y", 0.0)
-
-            # Handle raw integer values (pyjoycon might return integers that need normalization)
-            if isinstance(analog_x, int):
-                # Normalize from -32768 to 32767 range to -1.0 to 1.0
-                analog_x = analog_x / 32768.0 if analog_x != 0 else 0.0
-            if isinstance(analog_y, int):
-                # Normalize from -32768 to 32767 range to -1.0 to 1.0
-                analog_y = analog_y / 32768.0 if analog_y != 0 else 0.0
+            # The handler resolves the stick layout and integer scaling on the
+            # first status and reuses it for every later frame
+            analog_x, analog_y = car.joycon_handler.read_stick(status, "right")
 
             # Log analog values periodically (every 100ms to avoid spam)
-            import time
-            if not hasattr(update_status, "_last_log_time"):
-                update_status._last_log_time = 0
-                update_status._min_y = float('inf')
-                update_status._max_y = float('-inf')
             current_time = time.time()
-            if current_time - update_status._last_log_time > 0.1:  # Log every 100ms
+            if current_time - last_log_time > 0.1:  # Log every 100ms
                 # Track Y-axis range
                 if analog_y != 0.0:
-                    update_status._min_y = min(update_status._min_y, analog_y)
-                    update_status._max_y = max(update_status._max_y, analog_y)
-                print(f"[DEBUG] Analog X: {analog_x:.3f}, Analog Y: {analog_y:.3f} (Y range: {update_status._min_y:.3f} to {update_status._max_y:.3f})")
-                # Also log raw values if they're different
-                raw_analogs = status.get("analogs", {}).get("right", {})
-                if raw_analogs:
-                    print(f"[DEBUG] Raw analogs['right']: {raw_analogs}")
-                update_status._last_log_time = current_time
-
-            # Get command from JoyCon (rotated=True for single rotated controller)
-            command = car.get_joycon_command(status, "Plus", current_speed, rotated=True)
-
-            # Update speed based on button presses
-            forward, backward, left, right, current_speed = car.joycon_handler.parse_joycon_status(
+                    min_y = min(min_y, analog_y)
+                    max_y = max(max_y, analog_y)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        "Analog X: %.3f, Analog Y: %.3f (Y range: %.3f to %.3f)",
+                        analog_x, analog_y, min_y, max_y,
+                    )
+                    # Also log raw values if they're different
+                    try:
+                        raw_analogs = status["analogs"]["right"]
+                    except (KeyError, TypeError):
+                        raw_analogs = None
+                    if raw_analogs:
+                        logger.debug("Raw analogs['right']: %s", raw_analogs)
+                last_log_time = current_time
+
+            # Get command and button-selected speed from one parse
+            # (rotated=True for single rotated controller); the car and
+            # handler already log the resulting command and steering axis
+            command, current_speed = car.get_joycon_command_and_speed(
                 status, "Plus", current_speed, rotated=True
             )
 
-            # Debug: Log command values - especially steering
-            if left or right:
-                print(f"[STEERING COMMAND] left={left}, right={right}, Y-axis={analog_y:.3f}")
-            if forward or backward or left or right:
-                print(f"[DEBUG] Command: forward={forward}, backward={backward}, left={left}, right={right}, speed=0x{current_speed:02x}")
-
-            # Verify connection before sending command
-            if not car.is_connected():
-                print("[ERROR] Car is not connected! Attempting to reconnect...")
+            # Hand the frame to the command stream; it raises once the
+            # stream has stopped because a write failed or the link dropped
+            try:
+                car.set_command(command)
+            except Exception as e:
+                logger.error("Command stream stopped (%s). Attempting to reconnect...", e)
                 try:
+                    await car.stop_command_stream()
                     await car.connect_by_name(car_name)
+                    await car.start_command_stream()
                 except Exception as e:
-                    print(f"[ERROR] Failed to reconnect: {e}")
+                    logger.error("Failed to reconnect: %s", e)
                     break
-
-            # Send command to car
-            try:
-                await car.move_command(command)
-            except Exception as e:
-                print(f"[ERROR] Failed to send command: {e}")
-                import traceback
-                traceback.print_exc()
+                car.set_command(command)
 
     except KeyboardInterrupt:
         print("\nStopping...")
     finally:
-        await car.stop()
+        # Stop the stream first so it cannot overwrite the idle frame
+        await car.stop_command_stream()
+        if car.is_connected():
+            await car.stop()
         await car.disconnect()
         print("Disconnected.")
 
 
 if __name__ == "__main__":
+    try:
+        import uvloop
+    except ImportError:
+        pass
+    else:
+        # Optional libuv-based loop for the high-rate control loop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     asyncio.run(main())
 
@@ -26,6 +26,9 @@ setup(
             "hidapi>=0.14.0",
             "pyglm>=2.7.0",
         ],
+        "fast": [
+            "uvloop>=0.17.0; sys_platform != 'win32'",
+        ],
         "dev": [
             "pytest>=8.3.4",
             "pytest-asyncio>=0.24.0",
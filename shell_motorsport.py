@@ -4,8 +4,13 @@ import asyncio
 import base64
 import json
 import logging
+import os
+import stat
+import struct
+import tempfile
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Tuple
 
 from bleak import BLEDevice
 
@@ -21,6 +26,9 @@ try:
         VEHICLE_LIST_FILE,
         CAR_COMMANDS_FILE,
         DEFAULT_SPEED,
+        COMMAND_INTERVAL,
+        COMMAND_REFRESH_INTERVAL,
+        MOVE_REPEAT_INTERVAL,
     )
 except ImportError:
     # Fallback for direct script execution
@@ -34,11 +42,99 @@ except ImportError:
         VEHICLE_LIST_FILE,
         CAR_COMMANDS_FILE,
         DEFAULT_SPEED,
+        COMMAND_INTERVAL,
+        COMMAND_REFRESH_INTERVAL,
+        MOVE_REPEAT_INTERVAL,
     )
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# The key is fixed by the car protocol, so the cipher and its ciphertext memo
+# are built once at import and shared by every car instance
+_DEFAULT_ENCRYPTOR = MessageEncryptor(AES_KEY)
+
+# Control states stored in the commands file, as (forward, backward, left,
+# right, speed)
+_PRECOMPUTED_STATES: Tuple[Tuple[int, int, int, int, int], ...] = tuple(
+    (forward, backward, left, right, speed)
+    for forward in (0, 1)
+    for backward in (0, 1)
+    for left in (0, 1)
+    for right in (0, 1)
+    for speed in (0x16, 0x32, 0x48, 0x64)
+)
+
+# Control frame layout: unknown byte, "CTL" prefix, forward, backward, left,
+# right, a zero byte, speed, then six zero bytes of padding
+_CONTROL_FRAME = struct.Struct("B3s4BxB6x")
+
+
+def _build_shared_command_table() -> Tuple[Mapping, Mapping]:
+    """
+    Encrypt every precomputed control state once for the whole process.
+
+    Returns:
+        Tuple of read-only mappings: state tuple to frame bytes, and
+        commands-file key to base64 frame
+    """
+    plaintext = b"".join(
+        _CONTROL_FRAME.pack(0, CONTROL_PREFIX, forward, backward, left, right, speed)
+        for forward, backward, left, right, speed in _PRECOMPUTED_STATES
+    )
+    # Encrypt the whole table in one pass instead of one call per block
+    encrypted = _DEFAULT_ENCRYPTOR.encrypt_many(plaintext)
+    decoded = {}
+    encoded = {}
+    for index, state in enumerate(_PRECOMPUTED_STATES):
+        message = encrypted[index * 16:(index + 1) * 16]
+        decoded[state] = message
+        # The string key is only the on-disk format of the commands file
+        encoded["%d%d%d%d%d" % state] = base64.b64encode(message).decode("utf-8")
+    return MappingProxyType(decoded), MappingProxyType(encoded)
+
+
+def _write_json_atomic(path: Path, data: Dict) -> None:
+    """
+    Write JSON to a file so readers only ever see the old or the new content.
+
+    The data is written to a temporary file in the same directory and then
+    moved over the target with os.replace, so a crash mid-write cannot leave
+    a truncated file behind.
+
+    Args:
+        path: File to write
+        data: JSON-serializable data
+    """
+    path = Path(path)
+    fd, temp_name = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "w") as file:
+            json.dump(data, file, indent=2)
+            file.flush()
+            os.fsync(file.fileno())
+        # mkstemp creates the file private; keep the permissions of the file
+        # being replaced, or the usual ones for a new file
+        try:
+            mode = stat.S_IMODE(os.stat(path).st_mode)
+        except FileNotFoundError:
+            mode = 0o644
+        os.chmod(temp_name, mode)
+        os.replace(temp_name, path)
+    except BaseException:
+        try:
+            os.unlink(temp_name)
+        except OSError:
+            pass
+        raise
+
+
+# The table depends only on the protocol key, so it is built at import and
+# every car copies references from it instead of encrypting its own
+_COMMAND_TABLE, _ENCODED_COMMAND_TABLE = _build_shared_command_table()
+
 
 class Controller(ABC):
     """Abstract base class for RC car controllers."""
@@ -103,6 +199,7 @@ class ShellMotorsportCar(Controller):
         self,
         vehicle_list_file: Optional[Path] = None,
         commands_file: Optional[Path] = None,
+        joycon_handler: Optional[JoyConHandler] = None,
     ):
         """
         Initialize the ShellMotorsportCar instance.
@@ -110,15 +207,23 @@ class ShellMotorsportCar(Controller):
         Args:
             vehicle_list_file: Path to vehicle list JSON file. If None, uses default.
             commands_file: Path to precomputed commands JSON file. If None, uses default.
+            joycon_handler: JoyCon handler to use. Cars driven by different
+                JoyCon sides can share one; stick layouts and center
+                calibration are kept per side. If None, a new handler is
+                created.
         """
         self.ble_client = BLEClient()
-        self.encryptor = MessageEncryptor(AES_KEY)
-        self.joycon_handler = JoyConHandler()
+        self.encryptor = _DEFAULT_ENCRYPTOR
+        self.joycon_handler = joycon_handler or JoyConHandler()
 
         self.vehicle_list_file = vehicle_list_file or VEHICLE_LIST_FILE
         self.commands_file = commands_file or CAR_COMMANDS_FILE
         self.vehicle_list: Dict[str, str] = {}
         self.command_list: Dict[str, str] = {}
+        # Decoded command_list, keyed by (forward, backward, left, right, speed)
+        self._decoded_commands: Dict[Tuple[int, int, int, int, int], bytes] = {}
+        self._pending_command: bytes = IDLE_MESSAGE
+        self._stream_task: Optional[asyncio.Task] = None
 
         self._load_vehicle_list()
         self._load_commands()
@@ -129,18 +234,18 @@ class ShellMotorsportCar(Controller):
             if self.vehicle_list_file.exists():
                 with open(self.vehicle_list_file, "r") as file:
                     self.vehicle_list = json.load(file)
-                logger.debug(f"Loaded {len(self.vehicle_list)} vehicles from list")
+                logger.debug("Loaded %d vehicles from list", len(self.vehicle_list))
             else:
                 logger.info(
-                    f"Vehicle list file not found: {self.vehicle_list_file}. "
-                    "Creating empty list."
+                    "Vehicle list file not found: %s. Creating empty list.",
+                    self.vehicle_list_file,
                 )
                 self.vehicle_list = {}
         except json.JSONDecodeError as e:
-            logger.error(f"Error parsing vehicle list file: {e}")
+            logger.error("Error parsing vehicle list file: %s", e)
             self.vehicle_list = {}
         except Exception as e:
-            logger.error(f"Error loading vehicle list: {e}")
+            logger.error("Error loading vehicle list: %s", e)
             self.vehicle_list = {}
 
     def _load_commands(self) -> None:
@@ -149,38 +254,67 @@ class ShellMotorsportCar(Controller):
             if self.commands_file.exists():
                 with open(self.commands_file, "r") as file:
                     self.command_list = json.load(file)
-                logger.debug(f"Loaded {len(self.command_list)} precomputed commands")
+                logger.debug("Loaded %d precomputed commands", len(self.command_list))
             else:
-                logger.warning(
-                    f"Commands file not found: {self.commands_file}. "
-                    "Precomputed commands will not be available."
+                logger.info(
+                    "Commands file not found: %s. Building precomputed commands in memory.",
+                    self.commands_file,
                 )
                 self.command_list = {}
         except json.JSONDecodeError as e:
-            logger.error(f"Error parsing commands file: {e}")
+            logger.error("Error parsing commands file: %s", e)
             self.command_list = {}
         except Exception as e:
-            logger.error(f"Error loading commands: {e}")
+            logger.error("Error loading commands: %s", e)
             self.command_list = {}
 
+        self._index_commands()
+        # The table only depends on the protocol key, so a missing or partial
+        # file is filled in memory with one batched encrypt; nothing is written
+        # until precompute_messages() is called
+        if not all(state in self._decoded_commands for state in _PRECOMPUTED_STATES):
+            self._build_command_table()
+
+    def _index_commands(self) -> None:
+        """
+        Decode command_list once into the table used by retrieve_precomputed_message.
+
+        Keys are "{forward}{backward}{left}{right}{speed}" with the speed in
+        decimal. Entries that do not parse, do not decode or are not a single
+        16-byte frame are skipped, so those states fall back to building the
+        message on the fly and every stored value can be written as is.
+        """
+        self._decoded_commands = {}
+        for key, encoded_message in self.command_list.items():
+            try:
+                state = (int(key[0]), int(key[1]), int(key[2]), int(key[3]), int(key[4:]))
+                message = base64.b64decode(encoded_message)
+            except (ValueError, TypeError, IndexError) as e:
+                logger.warning("Skipping precomputed message %r: %s", key, e)
+                continue
+            if len(message) != 16:
+                logger.warning(
+                    "Skipping precomputed message %r: %d bytes, expected 16", key, len(message)
+                )
+                continue
+            self._decoded_commands[state] = message
+
     def _save_vehicle_list(self) -> None:
         """Save vehicle list to JSON file."""
         try:
-            with open(self.vehicle_list_file, "w") as file:
-                json.dump(self.vehicle_list, file, indent=2)
-            logger.debug(f"Saved {len(self.vehicle_list)} vehicles to list")
+            _write_json_atomic(self.vehicle_list_file, self.vehicle_list)
+            logger.debug("Saved %d vehicles to list", len(self.vehicle_list))
         except Exception as e:
-            logger.error(f"Error saving vehicle list: {e}")
+            logger.error("Error saving vehicle list: %s", e)
             raise
 
     def _save_commands(self) -> None:
         """Save precomputed commands to JSON file."""
         try:
-            with open(self.commands_file, "w") as file:
-                json.dump(self.command_list, file, indent=2)
-            logger.debug(f"Saved {len(self.command_list)} commands")
+            _write_json_atomic(self.commands_file, self.command_list)
+            logger.debug("Saved %d commands", len(self.command_list))
         except Exception as e:
-            logger.error(f"Error saving commands: {e}")
+            logger.error("Error saving commands: %s", e)
             raise
 
     def list_vehicles(self) -> Dict[str, str]:
@@ -204,6 +338,23 @@ class ShellMotorsportCar(Controller):
         """
         return self.vehicle_list.get(car_name)
 
+    def get_name_by_id(self, device_id: str) -> Optional[str]:
+        """
+        Get the registered name of a car by its device ID.
+
+        Args:
+            device_id: Device ID of the car (e.g., "QCAR-0000044")
+
+        Returns:
+            Registered car name if found, None otherwise
+        """
+        # The list holds a handful of cars and may be reassigned by callers,
+        # so scan it rather than maintain a reverse index that can go stale
+        for car_name, registered_id in self.vehicle_list.items():
+            if registered_id == device_id:
+                return car_name
+        return None
+
     def is_connected(self) -> bool:
         """
         Check if currently connected to a car.
@@ -226,32 +377,35 @@ class ShellMotorsportCar(Controller):
             "address": self.ble_client.device.address if self.ble_client.device else None,
         }
 
-    def precompute_messages(self) -> None:
+    def precompute_messages(self, force: bool = False) -> None:
         """
         Precompute messages for all control state combinations.
 
         This generates encrypted messages for all combinations of forward,
         backward, left, right, and speed settings, saving them to the
         commands file for faster retrieval.
+
+        Args:
+            force: Regenerate and save even if the commands file already
+                covers every state
         """
-        logger.info("Precomputing messages...")
-        speed_values = [0x16, 0x32, 0x48, 0x64]
-
-        for forward in [0, 1]:
-            for backward in [0, 1]:
-                for left in [0, 1]:
-                    for right in [0, 1]:
-                        for speed in speed_values:
-                            key = f"{forward}{backward}{left}{right}{speed}"
-                            message = self._create_message(
-                                forward, backward, left, right, speed
-                            )
-                            self.command_list[key] = base64.b64encode(message).decode(
-                                "utf-8"
-                            )
+        if (
+            not force
+            and self.commands_file.exists()
+            and all(state in self._decoded_commands for state in _PRECOMPUTED_STATES)
+        ):
+            logger.info("Precomputed messages already saved, skipping")
+            return
 
+        logger.info("Precomputing messages...")
+        self._build_command_table()
         self._save_commands()
-        logger.info(f"Precomputed {len(self.command_list)} messages")
+        logger.info("Precomputed %d messages", len(self.command_list))
+
+    def _build_command_table(self) -> None:
+        """Fill command_list and the decoded table from the shared precomputed table."""
+        self._decoded_commands.update(_COMMAND_TABLE)
+        self.command_list.update(_ENCODED_COMMAND_TABLE)
 
     def _create_message(
         self,
@@ -274,29 +428,48 @@ class ShellMotorsportCar(Controller):
         Returns:
             Encrypted message bytes (16 bytes)
 
+        Raises:
+            ValueError: If parameters are invalid
+        """
+        # _build_plaintext always yields one 16-byte block
+        return self.encryptor._encrypt_unchecked(
+            self._build_plaintext(forward, backward, left, right, speed)
+        )
+
+    def _build_plaintext(
+        self,
+        forward: int = 0,
+        backward: int = 0,
+        left: int = 0,
+        right: int = 0,
+        speed: int = DEFAULT_SPEED,
+    ) -> bytes:
+        """
+        Build the unencrypted 16-byte control frame.
+
+        Args:
+            forward: Forward movement flag (0 or 1)
+            backward: Backward movement flag (0 or 1)
+            left: Left turn flag (0 or 1)
+            right: Right turn flag (0 or 1)
+            speed: Speed value (0x16-0x64)
+
+        Returns:
+            Plaintext message bytes (16 bytes)
+
         Raises:
             ValueError: If parameters are invalid
         """
         # Validate inputs
-        if forward not in [0, 1] or backward not in [0, 1]:
+        if forward not in (0, 1) or backward not in (0, 1):
             raise ValueError("Forward and backward must be 0 or 1")
-        if left not in [0, 1] or right not in [0, 1]:
+        if left not in (0, 1) or right not in (0, 1):
             raise ValueError("Left and right must be 0 or 1")
         if not (0x00 <= speed <= 0xFF):
             raise ValueError("Speed must be between 0x00 and 0xFF")
 
-        message = bytearray(16)
-        message[0] = 0  # Unknown
-        message[1:4] = CONTROL_PREFIX  # CTL
-        message[4] = forward
-        message[5] = backward
-        message[6] = left
-        message[7] = right
-        message[8] = 0
-        message[9] = speed
-        # Remaining bytes are zeros
-
-        return self.encryptor.encrypt(bytes(message))
+        # One C-level pack into an immutable frame, no scratch buffer or copy
+        return _CONTROL_FRAME.pack(0, CONTROL_PREFIX, forward, backward, left, right, speed)
 
     def retrieve_precomputed_message(
         self,
@@ -319,27 +492,23 @@ class ShellMotorsportCar(Controller):
         Returns:
             Encrypted message bytes, or IDLE_MESSAGE if not found
         """
-        key = f"{forward}{backward}{left}{right}{speed}"
-        encoded_message = self.command_list.get(key)
-
-        if encoded_message:
-            try:
-                message = base64.b64decode(encoded_message)
-                logger.debug(f"[MESSAGE DEBUG] Retrieved precomputed message for key: {key}")
-                return message
-            except Exception as e:
-                logger.warning(f"Error decoding precomputed message: {e}")
-                return IDLE_MESSAGE
+        message = self._decoded_commands.get((forward, backward, left, right, speed))
+        if message is not None:
+            return message
 
         # Fallback to creating message on the fly
-        logger.debug(f"Precomputed message not found for key {key}, creating new one")
-        message = self._create_message(forward, backward, left, right, speed)
-        logger.debug(f"[MESSAGE DEBUG] Created new message for key: {key}")
-        return message
+        logger.debug(
+            "Precomputed message not found for %d%d%d%d%d, creating new one",
+            forward, backward, left, right, speed,
+        )
+        return self._create_message(forward, backward, left, right, speed)
 
     async def find_and_name_car(self, new_name: str) -> BLEDevice:
         """
-        Scan for nearby RC cars and assign a name to the first one found.
+        Scan for nearby RC cars and assign a name to the first unregistered one found.
+
+        Cars already in the vehicle list are skipped, so several cars can be
+        named one after another while they are all switched on.
 
         Args:
             new_name: Name to assign to the found car
@@ -350,14 +519,16 @@ class ShellMotorsportCar(Controller):
         Raises:
             TimeoutError: If no car is found after max retries
         """
-        logger.info(f"Discovering and naming car: {new_name}")
-        device = await self.ble_client.scan_for_device(device_name_pattern="QCAR")
+        logger.info("Discovering and naming car: %s", new_name)
+        device = await self.ble_client.scan_for_device(
+            device_name_pattern="QCAR", exclude=set(self.vehicle_list.values())
+        )
 
         if device:
             device_id = device.name
             self.vehicle_list[new_name] = device_id
             self._save_vehicle_list()
-            logger.info(f"Saved car: {new_name} -> {device_id}")
+            logger.info("Saved car: %s -> %s", new_name, device_id)
             return device
         else:
             raise TimeoutError("Could not find any RC car")
@@ -375,7 +546,7 @@ class ShellMotorsportCar(Controller):
         Raises:
             TimeoutError: If car is not found after max retries
         """
-        logger.info(f"Scanning for car: {device_id}")
+        logger.info("Scanning for car: %s", device_id)
         device = await self.ble_client.scan_for_device(device_id=device_id)
 
         if device:
@@ -400,7 +571,7 @@ class ShellMotorsportCar(Controller):
 
         device = await self.find_car(device_id)
         await self.ble_client.connect(device)
-        logger.info(f"Connected to {device_id}")
+        logger.info("Connected to %s", device_id)
 
     async def connect_by_name(self, car_name: str) -> None:
         """
@@ -424,6 +595,7 @@ class ShellMotorsportCar(Controller):
 
     async def disconnect(self) -> None:
         """Disconnect from the current car."""
+        await self.stop_command_stream()
         await self.ble_client.disconnect()
 
     async def move_command(self, message: bytes) -> None:
@@ -437,25 +609,163 @@ class ShellMotorsportCar(Controller):
             ConnectionError: If not connected
             ValueError: If message length is invalid
         """
-        if not self.is_connected():
+        # Read the client once; the connected case falls straight through
+        client = self.ble_client
+        if not client.is_connected:
             raise ConnectionError("Not connected to the car")
 
         if len(message) != 16:
             raise ValueError(f"Message must be exactly 16 bytes, got {len(message)}")
 
-        await self.ble_client.write_characteristic(message)
+        await client.write_characteristic(message)
 
     async def stop(self) -> None:
         """
         Command the car to stop.
 
+        The idle frame is written with an acknowledgement so a dropped packet
+        cannot leave the car moving.
+
         Raises:
             ConnectionError: If not connected
         """
         if not self.is_connected():
             raise ConnectionError("Not connected to the car")
 
-        await self.ble_client.write_characteristic(IDLE_MESSAGE)
+        await self.ble_client.write_characteristic(IDLE_MESSAGE, confirmed=True)
+
+    def set_command(self, message: bytes) -> None:
+        """
+        Set the control message the command stream sends on its next tick.
+
+        Args:
+            message: Encrypted message bytes (must be 16 bytes)
+
+        Raises:
+            ValueError: If message length is invalid
+            ConnectionError: If the command stream stopped because the
+                connection was lost
+            Exception: Whatever error made a write fail and stopped the
+                command stream
+        """
+        if len(message) != 16:
+            raise ValueError(f"Message must be exactly 16 bytes, got {len(message)}")
+        task = self._stream_task
+        if task is not None and task.done():
+            # The stream died on its own; don't let commands vanish silently
+            error = task.exception()
+            raise error if error is not None else ConnectionError("Command stream stopped")
+        self._pending_command = message
+
+    async def start_command_stream(
+        self,
+        interval: float = COMMAND_INTERVAL,
+        refresh_interval: float = COMMAND_REFRESH_INTERVAL,
+    ) -> None:
+        """
+        Start sending the current command to the car at a fixed cadence.
+
+        Each tick writes the message set by set_command() only if it differs
+        from the last one sent, or if refresh_interval has passed since then,
+        so a held or idle control state does not flood the BLE link.
+
+        Args:
+            interval: Seconds between ticks
+            refresh_interval: Maximum seconds before an unchanged message is resent
+
+        Raises:
+            ConnectionError: If not connected
+        """
+        if not self.is_connected():
+            raise ConnectionError("Not connected to the car")
+        if self._stream_task is not None and not self._stream_task.done():
+            return
+        self._stream_task = asyncio.ensure_future(
+            self._run_command_stream(interval, refresh_interval)
+        )
+
+    async def stop_command_stream(self) -> None:
+        """Stop the command stream started by start_command_stream()."""
+        task = self._stream_task
+        self._stream_task = None
+        if task is None:
+            return
+        if task.done():
+            # Already failed; the caller is shutting down, so only mark the
+            # error as seen
+            if not task.cancelled():
+                task.exception()
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def _run_command_stream(self, interval: float, refresh_interval: float) -> None:
+        """
+        Write coalesced control messages until cancelled.
+
+        Raises:
+            ConnectionError: If the connection is lost
+            Exception: Any error raised by a failed write
+        """
+        loop = asyncio.get_running_loop()
+        last_sent: Optional[bytes] = None
+        last_sent_at = 0.0
+        next_tick = loop.time()
+
+        try:
+            while self.is_connected():
+                message = self._pending_command
+                now = loop.time()
+                if message != last_sent or now - last_sent_at >= refresh_interval:
+                    await self.ble_client.write_characteristic(message)
+                    last_sent = message
+                    last_sent_at = now
+
+                # Pace against an absolute deadline so write time does not drift
+                # the cadence; after a stall, resync instead of bursting to catch up
+                next_tick += interval
+                now = loop.time()
+                if next_tick < now:
+                    next_tick = now
+                await asyncio.sleep(next_tick - now)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Kept on the task so the next set_command() raises it
+            logger.error("Command stream stopped: %s", e)
+            raise
+        logger.error("Command stream stopped: connection lost")
+        raise ConnectionError("Connection to the car was lost")
+
+    async def _repeat_command(
+        self, message: bytes, duration: float, interval: float = MOVE_REPEAT_INTERVAL
+    ) -> None:
+        """
+        Resend a control message until a duration has elapsed.
+
+        Writes are paced against absolute deadlines, like the command stream,
+        so the time spent in each write does not stretch the cadence. A write
+        that overruns its slot moves the schedule forward rather than being
+        followed by back-to-back writes.
+
+        Args:
+            message: Encrypted message bytes (must be 16 bytes)
+            duration: Duration in seconds
+            interval: Seconds between writes
+        """
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        end_time = next_tick + duration
+        while next_tick < end_time:
+            await self.move_command(message)
+            next_tick += interval
+            now = loop.time()
+            if next_tick < now:
+                next_tick = now
+            await asyncio.sleep(next_tick - now)
 
     # Convenience methods for common movements
     async def move_forward(
@@ -470,10 +780,7 @@ class ShellMotorsportCar(Controller):
         """
         message = self.retrieve_precomputed_message(forward=1, speed=speed)
         if duration:
-            end_time = asyncio.get_event_loop().time() + duration
-            while asyncio.get_event_loop().time() < end_time:
-                await self.move_command(message)
-                await asyncio.sleep(0.01)
+            await self._repeat_command(message, duration)
         else:
             await self.move_command(message)
 
@@ -489,10 +796,7 @@ class ShellMotorsportCar(Controller):
         """
         message = self.retrieve_precomputed_message(backward=1, speed=speed)
         if duration:
-            end_time = asyncio.get_event_loop().time() + duration
-            while asyncio.get_event_loop().time() < end_time:
-                await self.move_command(message)
-                await asyncio.sleep(0.01)
+            await self._repeat_command(message, duration)
         else:
             await self.move_command(message)
 
@@ -512,6 +816,27 @@ class ShellMotorsportCar(Controller):
         Returns:
             Encrypted control message bytes
         """
+        return self.get_joycon_command_and_speed(status, device_type, current_speed, rotated)[0]
+
+    def get_joycon_command_and_speed(
+        self, status: Dict, device_type: str = "Plus", current_speed: int = DEFAULT_SPEED, rotated: bool = False
+    ) -> Tuple[bytes, int]:
+        """
+        Get a control message and the resulting speed from JoyCon controller input.
+
+        Control loops that track the speed selected with the JoyCon buttons
+        should use this instead of parsing the status a second time.
+
+        Args:
+            status: JoyCon status dictionary from pyjoycon
+            device_type: "Plus" or "Minus"
+            current_speed: Current speed setting (used if no speed button pressed)
+            rotated: Whether the JoyCon is rotated (single controller mode).
+                    When True, uses y-axis as horizontal steering axis.
+
+        Returns:
+            Tuple of (encrypted control message bytes, speed setting)
+        """
         try:
             forward, backward, left, right, speed = self.joycon_handler.parse_joycon_status(
                 status, device_type, current_speed, rotated
@@ -520,8 +845,9 @@ class ShellMotorsportCar(Controller):
             # Log command generation for debugging
             if forward or backward or left or right:
                 logger.info(
-                    f"[COMMAND DEBUG] Generating command: "
-                    f"forward={forward}, backward={backward}, left={left}, right={right}, speed=0x{speed:02x}"
+                    "[COMMAND DEBUG] Generating command: "
+                    "forward=%d, backward=%d, left=%d, right=%d, speed=0x%02x",
+                    forward, backward, left, right, speed,
                 )
 
             message = self.retrieve_precomputed_message(
@@ -530,13 +856,13 @@ class ShellMotorsportCar(Controller):
 
             # Verify message was retrieved/created correctly
             if len(message) != 16:
-                logger.error(f"[ERROR] Invalid message length: {len(message)} bytes (expected 16)")
+                logger.error("[ERROR] Invalid message length: %d bytes (expected 16)", len(message))
 
-            return message
+            return (message, speed)
         except Exception as e:
-            logger.error(f"[ERROR] Failed to generate JoyCon command: {e}", exc_info=True)
+            logger.error("[ERROR] Failed to generate JoyCon command: %s", e, exc_info=True)
             # Return idle message on error
-            return IDLE_MESSAGE
+            return (IDLE_MESSAGE, current_speed)
 
     # Async context manager support
     async def __aenter__(self):
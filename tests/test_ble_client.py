@@ -0,0 +1,322 @@
+"""Tests for BLE client module."""
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from shell_motorsport import ble_client
+from shell_motorsport.ble_client import BLEClient
+from shell_motorsport.config import FILTERED_SCAN_TIMEOUT, SCAN_TIMEOUT, WRITE_CHAR_UUID
+
+
+@pytest.fixture(autouse=True)
+def clear_recent_devices():
+    """Start every test without cars or scan fallbacks remembered from earlier scans."""
+    ble_client._recent_devices.clear()
+    ble_client._service_filter_misses_cars = False
+    yield
+    ble_client._recent_devices.clear()
+    ble_client._service_filter_misses_cars = False
+
+
+def make_device(name, address="00:11:22:33:44:55"):
+    """Create a mock BLE device."""
+    device = MagicMock()
+    device.name = name
+    device.address = address
+    return device
+
+
+@pytest.mark.asyncio
+async def test_scan_for_device_returns_first_match():
+    """Test that scanning stops at the first matching advertisement."""
+    target = make_device("QCAR-0000044")
+
+    async def find(filterfunc, timeout, service_uuids):
+        assert service_uuids == ["0000fff0-0000-1000-8000-00805f9b34fb"]
+        assert not filterfunc(make_device("OTHER", address="AA:AA:AA:AA:AA:AA"), MagicMock())
+        assert filterfunc(target, MagicMock())
+        return target
+
+    client = BLEClient()
+    with patch("shell_motorsport.ble_client.BleakScanner.find_device_by_filter", side_effect=find):
+        device = await client.scan_for_device(device_id="QCAR-0000044")
+    assert device is target
+
+
+@pytest.mark.asyncio
+async def test_scan_falls_back_to_name_matching():
+    """Test that cars not advertising the service are still found by name."""
+    target = make_device("QCAR-0000044")
+    service_filters = []
+
+    async def find(filterfunc, timeout, service_uuids):
+        service_filters.append(service_uuids)
+        # The car exposes the service but leaves it out of its advertisement
+        if service_uuids is not None:
+            return None
+        assert filterfunc(target, MagicMock())
+        return target
+
+    client = BLEClient()
+    with patch("shell_motorsport.ble_client.BleakScanner.find_device_by_filter", side_effect=find):
+        device = await client.scan_for_device(device_id="QCAR-0000044")
+        assert device is target
+        assert service_filters == [["0000fff0-0000-1000-8000-00805f9b34fb"], None]
+
+        # Later scans go straight to name matching
+        ble_client._recent_devices.clear()
+        assert await client.scan_for_device(device_id="QCAR-0000044") is target
+    assert service_filters == [["0000fff0-0000-1000-8000-00805f9b34fb"], None, None]
+
+
+@pytest.mark.asyncio
+async def test_filtered_scan_window_is_short():
+    """Test that the service-filtered pass does not use the full scan timeout."""
+    timeouts = []
+
+    async def find(filterfunc, timeout, service_uuids):
+        timeouts.append((timeout, service_uuids is not None))
+        return None if service_uuids is not None else make_device("QCAR-0000044")
+
+    client = BLEClient()
+    with patch("shell_motorsport.ble_client.BleakScanner.find_device_by_filter", side_effect=find):
+        await client.scan_for_device(device_id="QCAR-0000044")
+    assert timeouts == [(FILTERED_SCAN_TIMEOUT, True), (SCAN_TIMEOUT, False)]
+
+
+@pytest.mark.asyncio
+async def test_scan_reuses_recently_seen_device():
+    """Test that a car seen by an earlier scan is returned without rescanning."""
+    target = make_device("QCAR-0000044")
+
+    async def find(filterfunc, timeout, service_uuids):
+        # Naming scan: any QCAR matches and is remembered
+        assert filterfunc(target, MagicMock())
+        return target
+
+    client = BLEClient()
+    with patch(
+        "shell_motorsport.ble_client.BleakScanner.find_device_by_filter", side_effect=find
+    ) as find_device:
+        assert await client.scan_for_device() is target
+        assert await client.scan_for_device(device_id="QCAR-0000044") is target
+    assert find_device.await_count == 1
+
+
+def test_recent_device_lookup_matches_like_scan():
+    """Test that the cache uses the scan's substring rule and drops stale cars."""
+    target = make_device("QCAR-0000044")
+    ble_client._remember_device(target, 100.0)
+    assert ble_client._find_recent_device("0000044", 101.0) is target
+    assert ble_client._find_recent_device("0000045", 101.0) is None
+    assert ble_client._find_recent_device("QCAR-0000044", 1000.0) is None
+
+    # Adding another car once the first has expired evicts it
+    ble_client._remember_device(make_device("QCAR-0000045"), 1000.0)
+    assert list(ble_client._recent_devices) == ["QCAR-0000045"]
+
+
+@pytest.mark.asyncio
+async def test_scan_skips_excluded_names():
+    """Test that a naming scan passes over cars that are already registered."""
+    registered = make_device("QCAR-0000044", address="AA:AA:AA:AA:AA:AA")
+    new_car = make_device("QCAR-0000045")
+
+    async def find(filterfunc, timeout, service_uuids):
+        assert not filterfunc(registered, MagicMock())
+        assert filterfunc(new_car, MagicMock())
+        return new_car
+
+    client = BLEClient()
+    with patch("shell_motorsport.ble_client.BleakScanner.find_device_by_filter", side_effect=find):
+        assert await client.scan_for_device(exclude={"QCAR-0000044"}) is new_car
+
+
+@pytest.mark.asyncio
+async def test_scan_skips_rejected_addresses():
+    """Test that a device with a non-matching name is not re-checked."""
+    other = make_device("OTHER", address="AA:AA:AA:AA:AA:AA")
+    nameless = make_device(None, address="BB:BB:BB:BB:BB:BB")
+    target = make_device("QCAR-0000044", address="BB:BB:BB:BB:BB:BB")
+
+    async def find(filterfunc, timeout, service_uuids):
+        assert not filterfunc(other, MagicMock())
+        other.name = "QCAR-0000044"
+        assert not filterfunc(other, MagicMock())
+        # A device seen before its name arrived is still considered
+        assert not filterfunc(nameless, MagicMock())
+        assert filterfunc(target, MagicMock())
+        return target
+
+    client = BLEClient()
+    with patch("shell_motorsport.ble_client.BleakScanner.find_device_by_filter", side_effect=find):
+        assert await client.scan_for_device() is target
+
+
+@pytest.mark.asyncio
+async def test_scan_for_device_timeout():
+    """Test that scanning raises after exhausting retries."""
+    client = BLEClient()
+    with patch(
+        "shell_motorsport.ble_client.BleakScanner.find_device_by_filter",
+        AsyncMock(return_value=None),
+    ) as find, patch("shell_motorsport.ble_client.asyncio.sleep", AsyncMock()) as sleep:
+        with pytest.raises(TimeoutError):
+            await client.scan_for_device()
+    assert find.await_count > 1
+    # Retries back off exponentially up to SCAN_RETRY_DELAY
+    delays = [call.args[0] for call in sleep.await_args_list]
+    assert delays == sorted(delays)
+    assert delays[0] == 0.25
+
+
+@pytest.mark.asyncio
+async def test_scan_for_device_budget_exhausted():
+    """Test that scanning gives up once the time budget is spent."""
+    client = BLEClient()
+    with patch(
+        "shell_motorsport.ble_client.BleakScanner.find_device_by_filter",
+        AsyncMock(return_value=None),
+    ) as find:
+        with pytest.raises(TimeoutError, match="within"):
+            await client.scan_for_device(budget=0)
+    find.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_idle_connection_is_released():
+    """Test that the keepalive watchdog disconnects an idle link."""
+    bleak_client = MagicMock()
+    bleak_client.connect = AsyncMock()
+    bleak_client.disconnect = AsyncMock()
+    bleak_client.write_gatt_char = AsyncMock()
+    bleak_client.is_connected = True
+
+    client = BLEClient(keepalive_seconds=0.05)
+    with patch("shell_motorsport.ble_client.BleakClient", return_value=bleak_client):
+        await client.connect(make_device("QCAR-0000044"))
+    await client.write_characteristic(bytes(16))
+    assert client.is_connected
+
+    await asyncio.sleep(0.2)
+    assert not client.is_connected
+    bleak_client.disconnect.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_write_uses_cached_characteristic():
+    """Test that writes reuse the characteristic resolved on connect."""
+    characteristic = MagicMock()
+    bleak_client = MagicMock()
+    bleak_client.connect = AsyncMock()
+    bleak_client.write_gatt_char = AsyncMock()
+    bleak_client.is_connected = True
+    bleak_client.services.get_characteristic.return_value = characteristic
+
+    client = BLEClient()
+    with patch("shell_motorsport.ble_client.BleakClient", return_value=bleak_client):
+        await client.connect(make_device("QCAR-0000044"))
+    await client.write_characteristic(bytes(16))
+    await client.write_characteristic(bytes(16))
+
+    bleak_client.services.get_characteristic.assert_called_once()
+    assert bleak_client.write_gatt_char.await_args[0][0] is characteristic
+
+
+@pytest.mark.asyncio
+async def test_write_without_response_when_supported():
+    """Test that control frames skip the ATT acknowledgement when possible."""
+    characteristic = MagicMock()
+    characteristic.properties = ["write", "write-without-response"]
+    bleak_client = MagicMock()
+    bleak_client.connect = AsyncMock()
+    bleak_client.write_gatt_char = AsyncMock()
+    bleak_client.is_connected = True
+    bleak_client.services.get_characteristic.return_value = characteristic
+
+    client = BLEClient()
+    with patch("shell_motorsport.ble_client.BleakClient", return_value=bleak_client):
+        await client.connect(make_device("QCAR-0000044"))
+    await client.write_characteristic(bytes(16))
+
+    bleak_client.write_gatt_char.assert_awaited_once_with(
+        characteristic, bytes(16), response=False
+    )
+
+    await client.write_characteristic(bytes(16), confirmed=True)
+    bleak_client.write_gatt_char.assert_awaited_with(
+        characteristic, bytes(16), response=True
+    )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writes_are_serialized():
+    """Test that overlapping writes go out one at a time and in call order."""
+    in_flight = 0
+    max_in_flight = 0
+    sent = []
+
+    async def write_gatt_char(char, data, response):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0)
+        sent.append(data)
+        in_flight -= 1
+
+    bleak_client = MagicMock()
+    bleak_client.connect = AsyncMock()
+    bleak_client.write_gatt_char = write_gatt_char
+    bleak_client.is_connected = True
+
+    client = BLEClient()
+    with patch("shell_motorsport.ble_client.BleakClient", return_value=bleak_client):
+        await client.connect(make_device("QCAR-0000044"))
+    frames = [bytes([i]) * 16 for i in range(10)]
+    await asyncio.gather(*(client.write_characteristic(frame) for frame in frames))
+
+    assert max_in_flight == 1
+    assert sent == frames
+
+
+@pytest.mark.asyncio
+async def test_reconnect_reuses_client():
+    """Test that reconnecting to the same address keeps the BleakClient."""
+    bleak_client = MagicMock()
+    bleak_client.address = "00:11:22:33:44:55"
+    bleak_client.connect = AsyncMock()
+    bleak_client.disconnect = AsyncMock()
+    bleak_client.is_connected = True
+
+    client = BLEClient()
+    with patch(
+        "shell_motorsport.ble_client.BleakClient", return_value=bleak_client
+    ) as client_class:
+        await client.connect(make_device("QCAR-0000044"))
+        await client.disconnect()
+        await client.connect(make_device("QCAR-0000044"))
+
+    client_class.assert_called_once()
+    assert bleak_client.connect.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_link_loss_marks_client_disconnected():
+    """Test that a dropped link is reflected without polling the backend."""
+    bleak_client = MagicMock()
+    bleak_client.connect = AsyncMock()
+    bleak_client.is_connected = True
+
+    client = BLEClient()
+    with patch(
+        "shell_motorsport.ble_client.BleakClient", return_value=bleak_client
+    ) as client_class:
+        await client.connect(make_device("QCAR-0000044"))
+    assert client.is_connected
+
+    client_class.call_args.kwargs["disconnected_callback"](bleak_client)
+    assert not client.is_connected
+    # Nothing from the lost link is reported as current
+    assert client.device is None
+    assert client._write_char == WRITE_CHAR_UUID
+    assert client._confirmed_response is True
@@ -1,5 +1,6 @@
 """Tests for encryption module."""
 import pytest
+from unittest.mock import patch
 from shell_motorsport.encryption import MessageEncryptor
 from shell_motorsport.config import AES_KEY
 
@@ -62,3 +63,38 @@ def test_encrypt_decrypt_roundtrip():
         decrypted = encryptor.decrypt(encrypted)
         assert decrypted == message
 
+
+def test_encrypt_is_deterministic():
+    """Test that the cached cipher yields the same block on repeated calls."""
+    encryptor = MessageEncryptor(AES_KEY)
+    message = b"1234567890123456"
+    first = encryptor.encrypt(message)
+    assert encryptor.encrypt(message) == first
+    assert encryptor.decrypt(first) == message
+    assert encryptor.encrypt(message) == first
+
+
+def test_encrypt_many():
+    """Test that batch encryption matches per-block encryption."""
+    encryptor = MessageEncryptor(AES_KEY)
+    blocks = [b"1234567890123456", b"abcdefghijklmnop"]
+    encrypted = encryptor.encrypt_many(b"".join(blocks))
+    assert encrypted == b"".join(encryptor.encrypt(block) for block in blocks)
+
+
+def test_encrypt_many_invalid_length():
+    """Test batch encryption with a partial block."""
+    encryptor = MessageEncryptor(AES_KEY)
+    with pytest.raises(ValueError, match="multiple of 16 bytes"):
+        encryptor.encrypt_many(b"1234567890123456short")
+
+
+def test_encrypt_cache_is_bounded():
+    """Test that memoized ciphertexts stop growing past the cap."""
+    encryptor = MessageEncryptor(AES_KEY)
+    messages = [bytes([i]) * 16 for i in range(4)]
+    with patch.object(MessageEncryptor, "MAX_CACHE_SIZE", 2):
+        for message in messages:
+            encryptor.encrypt(message)
+    assert len(encryptor._cache) == 2
+    assert encryptor.decrypt(encryptor.encrypt(messages[3])) == messages[3]
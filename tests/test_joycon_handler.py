@@ -1,6 +1,9 @@
 """Tests for JoyCon handler module."""
+import asyncio
+import threading
+
 import pytest
-from shell_motorsport.joycon_handler import JoyConHandler
+from shell_motorsport.joycon_handler import JoyConHandler, iter_joycon_status
 from shell_motorsport.config import DEFAULT_SPEED, DEFAULT_SPEED_PROFILES
 
 
@@ -152,3 +155,124 @@ def test_parse_joycon_status_error_handling():
     assert left == 0
     assert right == 0
 
+
+def test_read_stick_layouts():
+    """Test reading the stick from the supported status layouts."""
+    handler = JoyConHandler()
+    assert handler.read_stick({"analogs": {"right": {"x": 0.5, "y": -0.25}}}, "right") == (0.5, -0.25)
+    assert handler.read_stick({"stick": {"left": {"horizontal": 0.1}}}, "left") == (0.1, 0.0)
+    assert handler.read_stick({"left_stick_x": 16384}, "left") == (0.5, 0.0)
+    assert handler.read_stick({}, "right") == (0.0, 0.0)
+
+
+def test_read_stick_caches_layout():
+    """Test that the stick layout is resolved once and reused."""
+    handler = JoyConHandler()
+    assert handler.read_stick({"analogs": {"right": {"stick_x": 0.5, "y": 0.25}}}, "right") == (0.5, 0.25)
+    assert handler._stick_layouts["right"][:5] == ("analogs", "stick_x", "y", 1.0, 1.0)
+    assert handler.read_stick({"analogs": {"right": {"stick_x": -0.5, "y": 0.0}}}, "right") == (-0.5, 0.0)
+    # A different layout triggers re-resolution
+    assert handler.read_stick({"stick": {"right": {"x": 0.1, "y": 0.2}}}, "right") == (0.1, 0.2)
+    assert handler._stick_layouts["right"][:5] == ("stick", "x", "y", 1.0, 1.0)
+
+
+def test_read_stick_non_numeric_axis():
+    """Test that a non-numeric axis value reads as a centered stick."""
+    handler = JoyConHandler()
+    status = {
+        "buttons": {"right": {"sr": True, "sl": False}},
+        "analogs": {"right": {"x": None, "y": 0.1}},
+    }
+    assert handler.read_stick(status, "right") == (0.0, 0.0)
+    # Also after a good frame has cached the layout
+    assert handler.read_stick({"analogs": {"right": {"x": 0.5, "y": 0.1}}}, "right") == (0.5, 0.1)
+    assert handler.read_stick(status, "right") == (0.0, 0.0)
+    assert handler.parse_joycon_status(status, "Plus")[:4] == (1, 0, 0, 0)
+
+
+def test_center_calibration_stops_collecting():
+    """Test that calibration samples stop accumulating once calibrated."""
+    handler = JoyConHandler()
+    for i in range(250):
+        handler._update_center_calibration(0.02 + (i % 10) * 0.01)
+    calibration = handler._calibrations["right"]
+    assert calibration.calibrated
+    assert calibration.sample_count == 100
+    assert calibration.y_center == pytest.approx(0.065)
+
+
+def test_center_calibration_per_side():
+    """Test that two JoyCons sharing a handler keep separate centers."""
+    handler = JoyConHandler()
+    for i in range(100):
+        handler._get_steering(0.0, 0.02 + (i % 10) * 0.01, rotated=True, side="right")
+        handler._get_steering(0.0, 0.30 + (i % 10) * 0.01, rotated=True, side="left")
+    assert handler._calibrations["right"].y_center == pytest.approx(0.065)
+    assert handler._calibrations["left"].y_center == pytest.approx(0.345)
+    # Each side steers around its own center
+    assert handler._get_steering(0.0, 0.30, rotated=True, side="right")[:2] == (0, 1)
+    assert handler._get_steering(0.0, 0.30, rotated=True, side="left")[:2] == (1, 0)
+
+
+def test_get_steering():
+    """Test steering flags for normal and rotated orientation."""
+    handler = JoyConHandler()
+    assert handler._get_steering(-0.5, 0.0, rotated=False)[:2] == (1, 0)
+    assert handler._get_steering(0.5, 0.0, rotated=False)[:2] == (0, 1)
+    assert handler._get_steering(0.01, 0.0, rotated=False)[:2] == (0, 0)
+    # Rotated: Y is offset around an uncalibrated center of ~0.057
+    assert handler._get_steering(0.0, 0.09, rotated=True)[:2] == (0, 1)
+    assert handler._get_steering(0.0, 0.02, rotated=True)[:2] == (1, 0)
+    assert handler._get_steering(-0.5, 0.05, rotated=True)[:2] == (1, 0)
+
+
+def test_get_speed_from_buttons_priority():
+    """Test that the lowest speed wins when several speed buttons are held."""
+    handler = JoyConHandler()
+    status = {"buttons": {"right": {"a": False, "b": True, "y": False, "x": True}}}
+    assert handler._get_speed_from_buttons(status, "Plus") == DEFAULT_SPEED_PROFILES["medium"]
+    status["buttons"]["right"]["b"] = False
+    status["buttons"]["right"]["x"] = False
+    assert handler._get_speed_from_buttons(status, "Plus") is None
+
+
+class FakeJoyCon:
+    """Minimal stand-in for a pyjoycon JoyCon that reports from a thread."""
+
+    def __init__(self):
+        self.hooks = []
+        self.reports = 0
+
+    def register_update_hook(self, callback):
+        self.hooks.append(callback)
+        return callback
+
+    def get_status(self):
+        return {"report": self.reports}
+
+    def report(self, count=1):
+        def run():
+            for _ in range(count):
+                self.reports += 1
+                for hook in self.hooks:
+                    hook(self)
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        thread.join()
+
+
+@pytest.mark.asyncio
+async def test_iter_joycon_status_keeps_newest():
+    """Test that statuses arrive from the HID thread and only the newest is kept."""
+    joycon = FakeJoyCon()
+    statuses = iter_joycon_status(joycon)
+    first = asyncio.ensure_future(statuses.__anext__())
+    await asyncio.sleep(0)
+    joycon.report()
+    assert await asyncio.wait_for(first, 1.0) == {"report": 1}
+    # A burst while the consumer is busy collapses to its last report
+    joycon.report(count=3)
+    await asyncio.sleep(0)
+    assert await asyncio.wait_for(statuses.__anext__(), 1.0) == {"report": 4}
+    await statuses.aclose()
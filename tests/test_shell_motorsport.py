@@ -1,21 +1,72 @@
 """Tests for Shell Motorsport RC Car library."""
 import pytest
 import asyncio
-from unittest.mock import AsyncMock, patch, MagicMock, mock_open
+from unittest.mock import patch, MagicMock, mock_open
 from pathlib import Path
 import json
+import base64
 
-from shell_motorsport import ShellMotorsportCar
+from shell_motorsport import JoyConHandler, ShellMotorsportCar
 
 
-@pytest.fixture
-def car():
-    """Create a ShellMotorsportCar instance for testing."""
+@pytest.fixture(scope="module")
+def _module_car():
+    """Create one ShellMotorsportCar instance shared by the module."""
     with patch("shell_motorsport.Path.exists", return_value=True):
         with patch("builtins.open", mock_open(read_data='{"TEST_CAR": "QCAR-0000001"}')):
             return ShellMotorsportCar()
 
 
+@pytest.fixture
+def car(_module_car):
+    """
+    Provide the shared car and restore its state after each test.
+
+    Top-level dicts are copied and each test gets a fresh JoyConHandler, so
+    stick layouts and calibration never carry over. The encryptor and its
+    ciphertext memo are deliberately shared: they are process-wide in normal
+    use as well, and the memo only ever returns what AES would compute.
+    """
+    snapshot = {
+        name: value.copy() if isinstance(value, dict) else value
+        for name, value in vars(_module_car).items()
+    }
+    _module_car.joycon_handler = JoyConHandler()
+    yield _module_car
+    vars(_module_car).clear()
+    vars(_module_car).update(snapshot)
+
+
+class _FakeBLEClient:
+    """Lightweight stand-in for BLEClient that records what the car sends."""
+
+    def __init__(self, device=None, is_connected=False):
+        self.device = device
+        self.is_connected = is_connected
+        self.writes = []
+        self.disconnect_calls = 0
+        self.write_error = None
+
+    async def scan_for_device(
+        self, device_id=None, device_name_pattern="QCAR", budget=None, exclude=()
+    ):
+        self.excluded = exclude
+        return self.device
+
+    async def connect(self, device):
+        self.device = device
+        self.is_connected = True
+
+    async def disconnect(self):
+        self.disconnect_calls += 1
+        self.is_connected = False
+
+    async def write_characteristic(self, data, confirmed=False):
+        if self.write_error is not None:
+            raise self.write_error
+        self.writes.append((data, confirmed))
+
+
 @pytest.fixture
 def mock_ble_device():
     """Create a mock BLE device."""
@@ -26,56 +77,54 @@ def mock_ble_device():
 
 
 @pytest.mark.asyncio
-@patch("shell_motorsport.BLEClient")
-async def test_find_and_name_car(mock_ble_client_class, car, mock_ble_device):
+async def test_find_and_name_car(car, mock_ble_device, tmp_path):
     """Test finding and naming a car."""
-    mock_ble_client = MagicMock()
-    mock_ble_client.scan_for_device = AsyncMock(return_value=mock_ble_device)
-    mock_ble_client_class.return_value = mock_ble_client
-    car.ble_client = mock_ble_client
+    car.ble_client = _FakeBLEClient(device=mock_ble_device)
+    car.vehicle_list_file = tmp_path / "vehicles.json"
+
+    device = await car.find_and_name_car("TEST_CAR")
+    assert device is not None
+    assert device.name == "TEST_CAR"
+    assert "TEST_CAR" in car.vehicle_list
+    assert json.loads(car.vehicle_list_file.read_text())["TEST_CAR"] == "TEST_CAR"
+    # Cars that are already registered are not offered for naming again
+    assert car.ble_client.excluded == {"QCAR-0000001"}
+
+
+def test_save_vehicle_list_is_atomic(car, tmp_path):
+    """Test that a failed save leaves the previous vehicle list intact."""
+    car.vehicle_list_file = tmp_path / "vehicles.json"
+    car.vehicle_list_file.write_text('{"OLD_CAR": "QCAR-0000001"}')
+    car.vehicle_list = {"NEW_CAR": "QCAR-0000002"}
 
-    with patch("builtins.open", mock_open()) as mock_file:
-        device = await car.find_and_name_car("TEST_CAR")
-        assert device is not None
-        assert device.name == "TEST_CAR"
-        assert "TEST_CAR" in car.vehicle_list
+    with patch("shell_motorsport.json.dump", side_effect=OSError("disk full")):
+        with pytest.raises(OSError, match="disk full"):
+            car._save_vehicle_list()
+
+    assert json.loads(car.vehicle_list_file.read_text()) == {"OLD_CAR": "QCAR-0000001"}
+    assert list(tmp_path.iterdir()) == [car.vehicle_list_file]
 
 
 @pytest.mark.asyncio
-@patch("shell_motorsport.BLEClient")
-async def test_connect(mock_ble_client_class, car, mock_ble_device):
+async def test_connect(car, mock_ble_device):
     """Test connecting to a car."""
-    mock_ble_client = MagicMock()
-    mock_ble_client.scan_for_device = AsyncMock(return_value=mock_ble_device)
-    mock_ble_client.connect = AsyncMock()
-    mock_ble_client.is_connected = True
-    mock_ble_client.device = mock_ble_device
-    mock_ble_client_class.return_value = mock_ble_client
-    car.ble_client = mock_ble_client
+    car.ble_client = _FakeBLEClient(device=mock_ble_device)
 
     await car.connect("TEST_CAR")
     assert car.is_connected()
 
 
 @pytest.mark.asyncio
-@patch("shell_motorsport.BLEClient")
-async def test_connect_by_name(mock_ble_client_class, car, mock_ble_device):
+async def test_connect_by_name(car, mock_ble_device):
     """Test connecting to a car by name."""
     car.vehicle_list = {"TEST_CAR": "QCAR-0000001"}
-    mock_ble_client = MagicMock()
-    mock_ble_client.scan_for_device = AsyncMock(return_value=mock_ble_device)
-    mock_ble_client.connect = AsyncMock()
-    mock_ble_client.is_connected = True
-    mock_ble_client.device = mock_ble_device
-    mock_ble_client_class.return_value = mock_ble_client
-    car.ble_client = mock_ble_client
+    car.ble_client = _FakeBLEClient(device=mock_ble_device)
 
     await car.connect_by_name("TEST_CAR")
     assert car.is_connected()
 
 
 @pytest.mark.asyncio
-@patch("shell_motorsport.BLEClient")
 async def test_connect_by_name_not_found(car):
     """Test connecting by name when car is not registered."""
     car.vehicle_list = {}
@@ -84,17 +133,13 @@ async def test_connect_by_name_not_found(car):
 
 
 @pytest.mark.asyncio
-@patch("shell_motorsport.BLEClient")
-async def test_disconnect(mock_ble_client_class, car):
+async def test_disconnect(car):
     """Test disconnecting from a car."""
-    mock_ble_client = MagicMock()
-    mock_ble_client.disconnect = AsyncMock()
-    mock_ble_client.is_connected = True
-    mock_ble_client_class.return_value = mock_ble_client
-    car.ble_client = mock_ble_client
+    fake_client = _FakeBLEClient(is_connected=True)
+    car.ble_client = fake_client
 
     await car.disconnect()
-    mock_ble_client.disconnect.assert_called_once()
+    assert fake_client.disconnect_calls == 1
 
 
 def test_precompute_messages(car):
@@ -105,6 +150,43 @@ def test_precompute_messages(car):
     assert len(car.command_list) == 2 * 2 * 2 * 2 * 4  # forward*backward*left*right*speeds
 
 
+def test_missing_commands_file_builds_table_in_memory(tmp_path):
+    """Test that a missing commands file is filled in memory without writing it."""
+    commands_file = tmp_path / "commands.json"
+    car = ShellMotorsportCar(
+        vehicle_list_file=tmp_path / "vehicles.json", commands_file=commands_file
+    )
+    assert len(car.command_list) == 2 * 2 * 2 * 2 * 4
+    assert not commands_file.exists()
+    car.precompute_messages()
+    assert commands_file.exists()
+
+
+def test_command_table_shared_between_cars(tmp_path):
+    """Test that cars reuse the frames encrypted once at import."""
+    cars = [
+        ShellMotorsportCar(
+            vehicle_list_file=tmp_path / "vehicles.json",
+            commands_file=tmp_path / "commands.json",
+        )
+        for _ in range(2)
+    ]
+    first, second = (
+        car.retrieve_precomputed_message(forward=1, speed=0x32) for car in cars
+    )
+    assert first is second
+
+
+def test_precompute_messages_skips_when_loaded(car):
+    """Test that precomputing again is a no-op unless forced."""
+    car.precompute_messages()
+    with patch.object(car, "_save_commands") as save_commands:
+        car.precompute_messages()
+        save_commands.assert_not_called()
+        car.precompute_messages(force=True)
+        save_commands.assert_called_once()
+
+
 def test_retrieve_precomputed_message(car):
     """Test retrieving a precomputed message."""
     car.precompute_messages()
@@ -113,6 +195,29 @@ def test_retrieve_precomputed_message(car):
     assert len(message) == 16
 
 
+def test_retrieve_precomputed_message_decoded_once(car):
+    """Test that precomputed messages are served from the decoded table."""
+    car.precompute_messages()
+    expected = base64.b64decode(car.command_list[f"1000{0x32}"])
+    with patch.object(car, "_create_message") as create_message:
+        assert car.retrieve_precomputed_message(forward=1, speed=0x32) == expected
+    create_message.assert_not_called()
+    with pytest.raises(ValueError):
+        car.retrieve_precomputed_message(forward=2, speed=0x32)
+
+
+def test_index_commands_skips_malformed_entries(car):
+    """Test that only valid 16-byte frames are kept from the commands file."""
+    frame = bytes(range(16))
+    car.command_list = {
+        f"1000{0x32}": base64.b64encode(frame).decode("utf-8"),
+        f"0100{0x32}": base64.b64encode(frame[:8]).decode("utf-8"),
+        "not-a-key": base64.b64encode(frame).decode("utf-8"),
+    }
+    car._index_commands()
+    assert car._decoded_commands == {(1, 0, 0, 0, 0x32): frame}
+
+
 def test_retrieve_precomputed_message_not_found(car):
     """Test retrieving a message that doesn't exist (should create on the fly)."""
     car.command_list = {}
@@ -122,27 +227,20 @@ def test_retrieve_precomputed_message_not_found(car):
 
 
 @pytest.mark.asyncio
-@patch("shell_motorsport.BLEClient")
-async def test_move_command(mock_ble_client_class, car):
+async def test_move_command(car):
     """Test sending a move command."""
-    mock_ble_client = MagicMock()
-    mock_ble_client.write_characteristic = AsyncMock()
-    mock_ble_client.is_connected = True
-    mock_ble_client_class.return_value = mock_ble_client
-    car.ble_client = mock_ble_client
+    fake_client = _FakeBLEClient(is_connected=True)
+    car.ble_client = fake_client
 
     message = car.retrieve_precomputed_message(forward=1)
     await car.move_command(message)
-    mock_ble_client.write_characteristic.assert_called_once_with(message)
+    assert fake_client.writes == [(message, False)]
 
 
 @pytest.mark.asyncio
-@patch("shell_motorsport.BLEClient")
 async def test_move_command_not_connected(car):
     """Test move command when not connected."""
-    mock_ble_client = MagicMock()
-    mock_ble_client.is_connected = False
-    car.ble_client = mock_ble_client
+    car.ble_client = _FakeBLEClient(is_connected=False)
 
     message = car.retrieve_precomputed_message(forward=1)
     with pytest.raises(ConnectionError, match="Not connected"):
@@ -150,18 +248,14 @@ async def test_move_command_not_connected(car):
 
 
 @pytest.mark.asyncio
-@patch("shell_motorsport.BLEClient")
-async def test_stop(mock_ble_client_class, car):
+async def test_stop(car):
     """Test stopping the car."""
-    mock_ble_client = MagicMock()
-    mock_ble_client.write_characteristic = AsyncMock()
-    mock_ble_client.is_connected = True
-    mock_ble_client_class.return_value = mock_ble_client
-    car.ble_client = mock_ble_client
+    fake_client = _FakeBLEClient(is_connected=True)
+    car.ble_client = fake_client
 
     await car.stop()
     from shell_motorsport.config import IDLE_MESSAGE
-    mock_ble_client.write_characteristic.assert_called_once_with(IDLE_MESSAGE)
+    assert fake_client.writes == [(IDLE_MESSAGE, True)]
 
 
 def test_list_vehicles(car):
@@ -185,14 +279,20 @@ def test_get_device_id_not_found(car):
     assert device_id is None
 
 
+def test_get_name_by_id(car):
+    """Test looking up a registered name from a device ID."""
+    car.vehicle_list = {"CAR1": "QCAR-0000001", "CAR2": "QCAR-0000002"}
+    assert car.get_name_by_id("QCAR-0000002") == "CAR2"
+    assert car.get_name_by_id("QCAR-0000099") is None
+
+
 def test_is_connected(car):
     """Test checking connection status."""
-    mock_ble_client = MagicMock()
-    mock_ble_client.is_connected = True
-    car.ble_client = mock_ble_client
+    fake_client = _FakeBLEClient(is_connected=True)
+    car.ble_client = fake_client
     assert car.is_connected() is True
 
-    mock_ble_client.is_connected = False
+    fake_client.is_connected = False
     assert car.is_connected() is False
 
 
@@ -202,10 +302,7 @@ def test_get_connection_status(car):
     mock_ble_device.name = "TEST_CAR"
     mock_ble_device.address = "00:11:22:33:44:55"
 
-    mock_ble_client = MagicMock()
-    mock_ble_client.is_connected = True
-    mock_ble_client.device = mock_ble_device
-    car.ble_client = mock_ble_client
+    car.ble_client = _FakeBLEClient(device=mock_ble_device, is_connected=True)
 
     status = car.get_connection_status()
     assert status["connected"] is True
@@ -235,6 +332,12 @@ def test_create_message_validation(car):
         car._create_message(speed=0x100)  # Invalid speed
 
 
+def test_build_plaintext_layout(car):
+    """Test the byte layout of an unencrypted control frame."""
+    frame = car._build_plaintext(forward=1, left=1, speed=0x32)
+    assert frame == bytes.fromhex("0043544c010001000032000000000000")
+
+
 @pytest.mark.asyncio
 async def test_context_manager():
     """Test async context manager."""
@@ -251,3 +354,115 @@ def test_move_forward_sync(car):
     # Actual async execution would require more complex mocking
     assert hasattr(car, "move_forward")
     assert hasattr(car, "move_backward")
+
+
+@pytest.mark.asyncio
+async def test_move_forward_with_duration(car):
+    """Test that a timed move keeps writing until the duration elapses."""
+    fake_client = _FakeBLEClient(is_connected=True)
+    car.ble_client = fake_client
+
+    await car.move_forward(duration=0.05)
+
+    assert len(fake_client.writes) >= 2
+    message = car.retrieve_precomputed_message(forward=1)
+    assert fake_client.writes[-1] == (message, False)
+
+
+@pytest.mark.asyncio
+async def test_repeat_command_resyncs_after_slow_write(car):
+    """Test that a slow write does not trigger a burst of catch-up writes."""
+    fake_client = _FakeBLEClient(is_connected=True)
+    loop = asyncio.get_running_loop()
+    sent_at = []
+
+    async def write_characteristic(data, confirmed=False):
+        sent_at.append(loop.time())
+        if len(sent_at) == 2:
+            await asyncio.sleep(0.06)
+
+    fake_client.write_characteristic = write_characteristic
+    car.ble_client = fake_client
+
+    await car._repeat_command(car.retrieve_precomputed_message(forward=1), 0.15, interval=0.01)
+
+    gaps = [later - earlier for earlier, later in zip(sent_at, sent_at[1:])]
+    # Only the write straight after the stall may skip its wait
+    assert sum(1 for gap in gaps if gap < 0.005) <= 1
+
+
+@pytest.mark.asyncio
+async def test_command_stream_coalesces_unchanged_frames(car):
+    """Test that the command stream only resends unchanged frames on refresh."""
+    fake_client = _FakeBLEClient(is_connected=True)
+    car.ble_client = fake_client
+
+    message = car.retrieve_precomputed_message(forward=1)
+    car.set_command(message)
+    await car.start_command_stream(interval=0.005, refresh_interval=10.0)
+    await asyncio.sleep(0.05)
+    await car.stop_command_stream()
+
+    assert fake_client.writes == [(message, False)]
+
+
+@pytest.mark.asyncio
+async def test_command_stream_write_failure_reaches_set_command(car):
+    """Test that a failed stream write is raised to the caller."""
+    fake_client = _FakeBLEClient(is_connected=True)
+    fake_client.write_error = OSError("link broke")
+    car.ble_client = fake_client
+
+    await car.start_command_stream(interval=0.005)
+    await asyncio.sleep(0.02)
+
+    with pytest.raises(OSError, match="link broke"):
+        car.set_command(car.retrieve_precomputed_message(forward=1))
+    await car.stop_command_stream()
+
+
+@pytest.mark.asyncio
+async def test_command_stream_connection_loss_reaches_set_command(car):
+    """Test that a dropped link stops the stream with ConnectionError."""
+    fake_client = _FakeBLEClient(is_connected=True)
+    car.ble_client = fake_client
+
+    await car.start_command_stream(interval=0.005)
+    await asyncio.sleep(0.01)
+    fake_client.is_connected = False
+    await asyncio.sleep(0.02)
+
+    with pytest.raises(ConnectionError, match="lost"):
+        car.set_command(car.retrieve_precomputed_message(forward=1))
+    await car.stop_command_stream()
+
+
+def test_set_command_validation(car):
+    """Test that set_command rejects frames of the wrong size."""
+    with pytest.raises(ValueError, match="16 bytes"):
+        car.set_command(b"short")
+
+
+def test_get_joycon_command_and_speed(car):
+    """Test that the JoyCon command comes back with the selected speed."""
+    status = {
+        "buttons": {
+            "right": {"sr": True, "sl": False, "a": False, "b": True, "y": False, "x": False}
+        },
+        "analogs": {"right": {"x": 0.0, "y": 0.0}},
+    }
+    message, speed = car.get_joycon_command_and_speed(status, "Plus", 0x50)
+    assert speed == 0x32
+    assert message == car.retrieve_precomputed_message(forward=1, speed=0x32)
+    assert car.get_joycon_command(status, "Plus", 0x50) == message
+
+
+def test_shared_joycon_handler():
+    """Test that cars can share one JoyCon handler."""
+    handler = JoyConHandler()
+    with patch("shell_motorsport.Path.exists", return_value=True):
+        with patch("builtins.open", mock_open(read_data='{}')):
+            car_plus = ShellMotorsportCar(joycon_handler=handler)
+            car_minus = ShellMotorsportCar(joycon_handler=handler)
+    assert car_plus.joycon_handler is handler
+    assert car_minus.joycon_handler is handler